@@ -0,0 +1,421 @@
+"""
+Benchmark of tracker-import.py stages on synthetic Tracker payloads.
+
+Issues & changelog records are generated in batches, like pages of Tracker API responses
+are processed by the loader, and every stage is timed on each batch: JSON decoding, shaping
+of issues, changelog & status transitions, serialization for ClickHouse insert and parsing of
+duration strings. Rows per second of every stage and peak RSS of the process are reported
+and compared with baselines saved by previous runs.
+
+Usage:
+    python3 benchmarks/bench_import.py --issues 1000 100000
+    python3 benchmarks/bench_import.py --issues 1000000 --batch-size 50000
+    python3 benchmarks/bench_import.py --issues 1000 100000 --save-baseline
+
+Nothing is sent to Tracker or ClickHouse, environment variables required by the loader
+are filled with placeholders if not set
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'baselines.json')
+OUTPUT_FILE = os.path.join(ROOT_DIR, 'bench_output.txt')
+
+#Loader reads these at import, values are not used by benchmarked stages
+for env_name in ('TRACKER_ORG_ID', 'TRACKER_OAUTH_TOKEN', 'CH_HOST', 'CH_DB', 'CH_USER', 'CH_PASSWORD'):
+    os.environ.setdefault(env_name, 'bench')
+os.environ.setdefault('CH_ISSUES_TABLE', 'tracker_issues')
+os.environ.setdefault('CH_CHANGELOG_TABLE', 'tracker_changelog')
+
+sys.path.insert(0, ROOT_DIR)
+import isoduration
+from isoduration import parse_duration
+
+#Stages in the order they run on each batch
+STAGES = [
+    'decode_issues',
+    'decode_changelog',
+    'shape_issues',
+    'shape_changelog',
+    'status_transitions',
+    'serialize_issues',
+    'serialize_changelog',
+    'parse_duration',
+]
+
+#Result values which must be equal in baseline to compare speed with it
+COMPARED_PARAMS = ('batch_size', 'changelog_per_issue', 'insert_format', 'json_decoder', 'pandas_version')
+
+#Values of synthetic records, picked at random with fixed seed
+QUEUES = ['DEV', 'OPS', 'SUPPORT', 'SALES', 'HR']
+TYPES = ['Task', 'Bug', 'Epic', 'Story', 'Incident']
+PRIORITIES = ['Blocker', 'Critical', 'Normal', 'Minor', 'Trivial']
+STATUSES = ['Открыт', 'В работе', 'Ревью', 'Тестирование', 'Закрыт']
+RESOLUTIONS = ['Решен', 'Не будет исправлено', 'Дубликат']
+DURATIONS = ['PT30M', 'PT1H', 'PT4H', 'PT1.5H', 'P1D', 'P1DT4H', 'P2D', 'P1W', 'P2W', 'PT15M', None]
+USERS = ['User ' + str(i) for i in range(200)]
+TAGS = ['backend', 'frontend', 'infra', 'urgent', 'customer', 'regression', 'tech-debt']
+
+def load_loader_module():
+    """
+    Import tracker-import.py, its file name is not a valid module name
+
+    Arguments:
+        Nothing
+    Returns:
+        loader module
+    """
+    spec = importlib.util.spec_from_file_location('tracker_import', os.path.join(ROOT_DIR, 'tracker-import.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def format_tracker_time(value):
+    """
+    Format datetime the way Tracker API does, e.g. 2023-03-01T10:22:33.123+0000
+    """
+    return value.strftime('%Y-%m-%dT%H:%M:%S.') + '{:03d}+0000'.format(value.microsecond // 1000)
+
+def make_issue(number, rnd, start_time):
+    """
+    Make synthetic Tracker issue with nested objects, lists, custom fields & duration strings
+
+    Arguments:
+        number (int): number of issue, makes its id & key
+        rnd (Random): source of random values
+        start_time (datetime): earliest creation time
+    Returns:
+        issue as decoded JSON object
+    """
+    queue = rnd.choice(QUEUES)
+    created_at = start_time + timedelta(minutes=rnd.randrange(60 * 24 * 365))
+    updated_at = created_at + timedelta(minutes=rnd.randrange(1, 60 * 24 * 90))
+    status = rnd.choice(STATUSES)
+    issue = {
+        'self': 'https://api.tracker.yandex.net/v2/issues/{}-{}'.format(queue, number),
+        'id': '{:024x}'.format(number),
+        'key': '{}-{}'.format(queue, number),
+        'version': rnd.randrange(1, 50),
+        'summary': 'Synthetic issue {} of {} queue'.format(number, queue) + ' with longer text' * rnd.randrange(5),
+        'statusStartTime': format_tracker_time(updated_at),
+        'createdAt': format_tracker_time(created_at),
+        'updatedAt': format_tracker_time(updated_at),
+        'commentWithoutExternalMessageCount': rnd.randrange(20),
+        'commentWithExternalMessageCount': rnd.randrange(3),
+        'votes': rnd.randrange(5),
+        'favorite': rnd.random() < 0.1,
+        'updatedBy': {'self': 'u', 'id': '1', 'display': rnd.choice(USERS)},
+        'createdBy': {'self': 'u', 'id': '2', 'display': rnd.choice(USERS)},
+        'type': {'self': 't', 'id': '1', 'key': 'task', 'display': rnd.choice(TYPES)},
+        'priority': {'self': 'p', 'id': '3', 'key': 'normal', 'display': rnd.choice(PRIORITIES)},
+        'queue': {'self': 'q', 'id': '1', 'key': queue, 'display': queue + ' queue'},
+        'status': {'self': 's', 'id': '1', 'key': 'status', 'display': status},
+        'previousStatus': {'self': 's', 'id': '2', 'key': 'previous', 'display': rnd.choice(STATUSES)},
+        'tags': rnd.sample(TAGS, rnd.randrange(3)),
+        'followers': [{'self': 'u', 'id': str(i), 'display': rnd.choice(USERS)} for i in range(rnd.randrange(4))],
+        'access': [{'self': 'u', 'id': '1', 'display': rnd.choice(USERS)}],
+        #custom fields of queues, dropped by the loader while decoding
+        queue.lower() + 'CustomText': 'x' * rnd.randrange(200),
+        queue.lower() + 'CustomNumber': rnd.random() * 1000,
+        queue.lower() + 'CustomUser': {'self': 'u', 'id': '3', 'display': rnd.choice(USERS)},
+    }
+    if rnd.random() < 0.8:
+        issue['assignee'] = {'self': 'u', 'id': '4', 'display': rnd.choice(USERS)}
+    if rnd.random() < 0.6:
+        issue['boards'] = [{'id': i, 'name': 'Board ' + str(i)} for i in rnd.sample(range(30), rnd.randrange(1, 3))]
+    if rnd.random() < 0.5:
+        issue['sprint'] = [{'self': 's', 'id': str(i), 'display': 'Sprint ' + str(i)} for i in rnd.sample(range(100), rnd.randrange(1, 3))]
+    if rnd.random() < 0.5:
+        issue['storyPoints'] = rnd.choice([1, 2, 3, 5, 8, 13, 0.5])
+    if rnd.random() < 0.3:
+        issue['components'] = [{'self': 'c', 'id': '1', 'display': 'Component ' + str(rnd.randrange(20))}]
+    if rnd.random() < 0.3:
+        issue['parent'] = {'self': 'i', 'id': '1', 'key': '{}-{}'.format(queue, rnd.randrange(number + 1)), 'display': 'Parent issue'}
+    if rnd.random() < 0.2:
+        issue['epic'] = {'self': 'i', 'id': '1', 'key': 'EPIC-1', 'display': 'Epic ' + str(rnd.randrange(10))}
+    if rnd.random() < 0.3:
+        issue['deadline'] = (created_at + timedelta(days=rnd.randrange(60))).strftime('%Y-%m-%d')
+        issue['start'] = created_at.strftime('%Y-%m-%d')
+        issue['end'] = issue['deadline']
+    if rnd.random() < 0.2:
+        issue['checklistDone'] = rnd.randrange(5)
+        issue['checklistTotal'] = 5
+    for col in ('originalEstimation', 'spent', 'estimation'):
+        duration = rnd.choice(DURATIONS)
+        if duration is not None:
+            issue[col] = duration
+    if status == 'Закрыт':
+        issue['resolvedAt'] = format_tracker_time(updated_at)
+        issue['resolvedBy'] = {'self': 'u', 'id': '5', 'display': rnd.choice(USERS)}
+        issue['resolution'] = {'self': 'r', 'id': '1', 'key': 'fixed', 'display': rnd.choice(RESOLUTIONS)}
+    return issue
+
+def make_changelog(issue, count, rnd):
+    """
+    Make synthetic changelog records of issue: status changes with assignee changes,
+    field updates & worklog records
+
+    Arguments:
+        issue (dict): issue made by make_issue
+        count (int): number of changelog records
+        rnd (Random): source of random values
+    Returns:
+        list of changelog records as decoded JSON objects
+    """
+    changelog = []
+    updated_at = datetime.strptime(issue['createdAt'][:19], '%Y-%m-%dT%H:%M:%S')
+    status = STATUSES[0]
+    for number in range(count):
+        updated_at += timedelta(minutes=rnd.randrange(1, 60 * 24 * 5))
+        entry = {
+            'id': '{}-{}'.format(issue['id'], number),
+            'self': 'https://api.tracker.yandex.net/v2/issues/{}/changelog/{}'.format(issue['key'], number),
+            'issue': {'self': 'i', 'id': issue['id'], 'key': issue['key'], 'display': issue['summary'][:20]},
+            'updatedAt': format_tracker_time(updated_at),
+            'updatedBy': {'self': 'u', 'id': '1', 'display': rnd.choice(USERS)},
+            'transport': 'front',
+        }
+        kind = rnd.random()
+        if kind < 0.4:
+            next_status = rnd.choice(STATUSES)
+            entry['type'] = 'IssueWorkflow'
+            entry['fields'] = [
+                {'field': {'self': 'f', 'id': 'status', 'display': 'Статус'},
+                 'from': {'self': 's', 'id': '1', 'key': 'from', 'display': status},
+                 'to': {'self': 's', 'id': '2', 'key': 'to', 'display': next_status}},
+                {'field': {'self': 'f', 'id': 'assignee', 'display': 'Исполнитель'},
+                 'from': None,
+                 'to': {'self': 'u', 'id': '4', 'display': rnd.choice(USERS)}},
+            ]
+            status = next_status
+        elif kind < 0.8:
+            entry['type'] = 'IssueUpdated'
+            entry['fields'] = [
+                {'field': {'self': 'f', 'id': 'summary', 'display': 'Задача'},
+                 'from': issue['summary'], 'to': issue['summary'] + ' updated'},
+                {'field': {'self': 'f', 'id': 'spent', 'display': 'Затрачено времени'},
+                 'from': rnd.choice(DURATIONS), 'to': rnd.choice(DURATIONS)},
+            ]
+        else:
+            entry['type'] = 'IssueWorkLogged'
+            entry['worklog'] = [{'self': 'w', 'id': str(number), 'display': 'worklog'}]
+        changelog.append(entry)
+    return changelog
+
+def make_batch(first_number, size, changelog_per_issue, rnd, start_time):
+    """
+    Make batch of synthetic issues with their changelog, serialized the same way Tracker API sends them
+
+    Arguments:
+        first_number (int): number of the first issue in batch
+        size (int): number of issues
+        changelog_per_issue (int): number of changelog records of each issue
+        rnd (Random): source of random values
+        start_time (datetime): earliest creation time
+    Returns:
+        tuple of issues & changelog response bodies (bytes) and duration strings of issues
+    """
+    issues = [make_issue(number, rnd, start_time) for number in range(first_number, first_number + size)]
+    changelog = []
+    for issue in issues:
+        changelog.extend(make_changelog(issue, changelog_per_issue, rnd))
+    durations = [issue[col] for issue in issues for col in ('originalEstimation', 'spent', 'estimation') if col in issue]
+    return json.dumps(issues).encode('utf-8'), json.dumps(changelog).encode('utf-8'), durations
+
+def peak_rss_mb():
+    """
+    Peak resident set size of the process in megabytes, ru_maxrss is in kilobytes on Linux & bytes on macOS
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / (1024 * 1024) if sys.platform == 'darwin' else peak_rss / 1024
+
+def run_batch(ti, issues_content, changelog_content, durations, timings, rows):
+    """
+    Run every stage on one batch, adding stage time & number of processed rows to timings & rows
+    """
+    def timed(stage, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        timings[stage] += time.perf_counter() - started
+        return result
+
+    issues_json = timed('decode_issues', ti.decode_tracker_json, issues_content, ti.TRACKER_ISSUE_FIELDS)
+    rows['decode_issues'] += len(issues_json)
+    changelog_json = timed('decode_changelog', ti.decode_tracker_json, changelog_content, ti.TRACKER_CHANGELOG_FIELDS)
+    rows['decode_changelog'] += len(changelog_json)
+
+    issues_df = timed('shape_issues', ti.shape_issues_data, issues_json)
+    rows['shape_issues'] += len(issues_df)
+    changelog_df = timed('shape_changelog', ti.shape_issue_changelog_data, changelog_json)
+    rows['shape_changelog'] += len(changelog_df)
+    transitions_df = timed('status_transitions', ti.shape_status_transitions, changelog_json, issues_df)
+    rows['status_transitions'] += len(transitions_df)
+
+    timed('serialize_issues', ti.serialize_dataframe, issues_df, ti.issues_date_time_columns, ti.issues_decimal_columns)
+    rows['serialize_issues'] += len(issues_df)
+    timed('serialize_changelog', ti.serialize_dataframe, changelog_df, ti.issue_changelog_date_time_columns)
+    rows['serialize_changelog'] += len(changelog_df)
+
+    #parse cache is cleared, so every distinct duration of batch is parsed again
+    isoduration.parser.parse_components.cache_clear()
+    timed('parse_duration', lambda: [parse_duration(duration) for duration in durations])
+    rows['parse_duration'] += len(durations)
+
+def run_benchmark(ti, issues_count, batch_size, changelog_per_issue, seed):
+    """
+    Generate synthetic data in batches & time every stage
+
+    Arguments:
+        ti (module): loader module
+        issues_count (int): number of issues
+        batch_size (int): number of issues in one batch
+        changelog_per_issue (int): number of changelog records of each issue
+        seed (int): seed of random values
+    Returns:
+        dict with stage timings, processed rows, rows per second, peak RSS
+        and settings of the loader which change its speed
+    """
+    rnd = random.Random(seed)
+    start_time = datetime(2022, 1, 1)
+    timings = dict.fromkeys(STAGES, 0.0)
+    rows = dict.fromkeys(STAGES, 0)
+    generate_seconds = 0.0
+    for first_number in range(0, issues_count, batch_size):
+        started = time.perf_counter()
+        issues_content, changelog_content, durations = make_batch(
+            first_number, min(batch_size, issues_count - first_number), changelog_per_issue, rnd, start_time)
+        generate_seconds += time.perf_counter() - started
+        run_batch(ti, issues_content, changelog_content, durations, timings, rows)
+        del issues_content, changelog_content, durations
+
+    return {
+        'issues': issues_count,
+        'batch_size': batch_size,
+        'changelog_per_issue': changelog_per_issue,
+        'insert_format': ti.CH_INSERT_FORMAT,
+        'json_decoder': ti.TRACKER_JSON_DECODER,
+        'pandas_version': ti.pd.__version__,
+        'generate_seconds': round(generate_seconds, 3),
+        'seconds': {stage: round(timings[stage], 4) for stage in STAGES},
+        'rows': rows,
+        'rows_per_sec': {stage: round(rows[stage] / timings[stage], 1) if timings[stage] else 0.0 for stage in STAGES},
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+def load_baselines(path=BASELINES_FILE):
+    """
+    Load saved baselines: scale (number of issues) -> result of run_benchmark
+    """
+    try:
+        with open(path) as baselines_file:
+            return json.load(baselines_file)
+    except FileNotFoundError:
+        return {}
+
+def save_baselines(baselines, path=BASELINES_FILE):
+    """
+    Save baselines, keys are sorted so file changes only with measured values
+    """
+    with open(path, 'w') as baselines_file:
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write('\n')
+
+def compare_with_baseline(result, baseline, tolerance):
+    """
+    Compare rows per second of stages with baseline. Baseline measured with other parameters,
+    insert format, JSON decoder or pandas version is not compared
+
+    Arguments:
+        result (dict): result of run_benchmark
+        baseline (dict): result of earlier run with the same scale, None if there is no baseline
+        tolerance (float): allowed relative slowdown, e.g. 0.2 for 20%
+    Returns:
+        tuple of report lines & list of regressed stages
+    """
+    if baseline is None:
+        return ['  no baseline for {} issues'.format(result['issues'])], []
+    for param in COMPARED_PARAMS:
+        if baseline.get(param) != result[param]:
+            return ['  baseline was measured with {}={}, not compared'.format(param, baseline.get(param))], []
+
+    lines = []
+    regressions = []
+    for stage in STAGES:
+        baseline_rate = baseline['rows_per_sec'].get(stage)
+        if not baseline_rate:
+            continue
+        change = result['rows_per_sec'][stage] / baseline_rate - 1
+        regressed = change < -tolerance
+        if regressed:
+            regressions.append(stage)
+        lines.append('  {:<22}{:>+8.1%}{}'.format(stage, change, '  REGRESSION' if regressed else ''))
+    rss_change = result['peak_rss_mb'] / baseline['peak_rss_mb'] - 1 if baseline.get('peak_rss_mb') else 0.0
+    lines.append('  {:<22}{:>+8.1%}'.format('peak_rss_mb', rss_change))
+    return lines, regressions
+
+def format_result(result):
+    """
+    Format result of run_benchmark as table lines
+    """
+    lines = ['{} issues, batches of {}, {} changelog records per issue (generated in {:.1f} s)'.format(
+        result['issues'], result['batch_size'], result['changelog_per_issue'], result['generate_seconds'])]
+    lines.append('  {:<22}{:>12}{:>10}{:>14}'.format('stage', 'rows', 'seconds', 'rows/sec'))
+    for stage in STAGES:
+        lines.append('  {:<22}{:>12}{:>10.3f}{:>14,.0f}'.format(
+            stage, result['rows'][stage], result['seconds'][stage], result['rows_per_sec'][stage]))
+    lines.append('  peak RSS: {:.1f} MB'.format(result['peak_rss_mb']))
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tracker-import.py stages on synthetic Tracker payloads')
+    parser.add_argument('--issues', type=int, nargs='+', default=[1000], help='numbers of issues to benchmark, e.g. 1000 100000 1000000')
+    parser.add_argument('--batch-size', type=int, default=10000, help='number of issues processed at once')
+    parser.add_argument('--changelog-per-issue', type=int, default=5, help='number of changelog records of each issue')
+    parser.add_argument('--seed', type=int, default=1, help='seed of synthetic data')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative slowdown against baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='save results as baselines of their scales')
+    parser.add_argument('--baselines', default=BASELINES_FILE, help='file with baselines')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='file to write the report to')
+    args = parser.parse_args()
+
+    ti = load_loader_module()
+    baselines = load_baselines(args.baselines)
+    report = ['tracker-import benchmark, {}, Python {}, pandas {}, insert format {}, JSON decoder {}'.format(
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S'), sys.version.split()[0], ti.pd.__version__,
+        ti.CH_INSERT_FORMAT, ti.TRACKER_JSON_DECODER)]
+    print(report[0], flush=True)
+    regressions = []
+    #scales run from the smallest one, so peak RSS of each scale is not hidden by a bigger one
+    for issues_count in sorted(args.issues):
+        result = run_benchmark(ti, issues_count, args.batch_size, args.changelog_per_issue, args.seed)
+        comparison, scale_regressions = compare_with_baseline(result, baselines.get(str(issues_count)), args.tolerance)
+        lines = [''] + format_result(result) + ['  against baseline:'] + comparison
+        print('\n'.join(lines), flush=True)
+        report.extend(lines)
+        regressions.extend('{} issues: {}'.format(issues_count, stage) for stage in scale_regressions)
+        if args.save_baseline:
+            baselines[str(issues_count)] = result
+
+    summary = []
+    if args.save_baseline:
+        save_baselines(baselines, args.baselines)
+        summary.append('Baselines saved to ' + args.baselines)
+    if regressions:
+        summary.append('Regressions (slower than baseline by more than {:.0%}):'.format(args.tolerance))
+        summary.extend('  ' + regression for regression in regressions)
+    report.extend([''] + summary)
+    with open(args.output, 'w') as output_file:
+        output_file.write('\n'.join(report) + '\n')
+    print('\n'.join([''] + summary + ['Report written to ' + args.output]))
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,28 @@
-from isoduration.formatter import format_duration
+from isoduration.formatter import format_components, format_duration, format_durations
 from isoduration.formatter.exceptions import DurationFormattingException
-from isoduration.parser import parse_duration
+from isoduration.parser import parse_compact_duration, parse_duration
 from isoduration.parser.exceptions import DurationParsingException
+from isoduration.types import CompactDuration
+from isoduration.working_time import (
+    WorkingCalendar,
+    duration_to_minutes,
+    durations_to_minutes,
+    minutes_to_duration,
+    minutes_to_durations,
+)
 
 __all__ = (
     "format_duration",
+    "format_components",
+    "format_durations",
     "parse_duration",
+    "parse_compact_duration",
+    "CompactDuration",
     "DurationParsingException",
     "DurationFormattingException",
+    "WorkingCalendar",
+    "duration_to_minutes",
+    "durations_to_minutes",
+    "minutes_to_duration",
+    "minutes_to_durations",
 )
@@ -1,3 +1,6 @@
 PERIOD_PREFIX = "P"
 TIME_PREFIX = "T"
 WEEK_PREFIX = "W"
+
+PARSE_CACHE_SIZE = 1024
+FORMAT_CACHE_SIZE = 1024
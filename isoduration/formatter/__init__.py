@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from decimal import Decimal
+from functools import lru_cache
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
 
-from isoduration.constants import PERIOD_PREFIX
+from isoduration.constants import FORMAT_CACHE_SIZE, PERIOD_PREFIX, TIME_PREFIX
 from isoduration.formatter.checking import check_global_sign
+from isoduration.formatter.exceptions import DurationFormattingException
 from isoduration.formatter.formatting import format_date, format_time
 
 if TYPE_CHECKING:  # pragma: no cover
     from isoduration.types import Duration
 
+Number = Union[int, float, Decimal]
+
 
 def format_duration(duration: Duration) -> str:
     global_sign = check_global_sign(duration)
@@ -22,3 +28,104 @@ def format_duration(duration: Duration) -> str:
         return f"{PERIOD_PREFIX}0D"
 
     return f"{sign_str}{duration_str}"
+
+
+def format_components(
+    years: Number = 0,
+    months: Number = 0,
+    days: Number = 0,
+    weeks: Number = 0,
+    hours: Number = 0,
+    minutes: Number = 0,
+    seconds: Number = 0,
+) -> str:
+    """
+    Format duration components like format_duration does, without building a
+    Duration. Results are cached, so repeated durations are formatted once.
+    """
+    components = (years, months, days, weeks, hours, minutes, seconds)
+    # Equal numbers share a cache key, but Decimal('1.0') is written unlike 1.
+    if any(isinstance(value, Decimal) for value in components):
+        return join_components(*components)
+
+    return format_cached_components(*components)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_cached_components(*components: Number) -> str:
+    return join_components(*components)
+
+
+def join_components(
+    years: Number,
+    months: Number,
+    days: Number,
+    weeks: Number,
+    hours: Number,
+    minutes: Number,
+    seconds: Number,
+) -> str:
+    if weeks and (years or months or days):
+        raise DurationFormattingException(
+            "Weeks are incompatible with other date designators"
+        )
+
+    components = (years, months, days, weeks, hours, minutes, seconds)
+    if not any(components):
+        return f"{PERIOD_PREFIX}0D"
+
+    # Sign is global when no component is positive, as in check_global_sign.
+    global_sign = -1 if all(value <= 0 for value in components) else 1
+    parts = ["-" if global_sign < 0 else "", PERIOD_PREFIX]
+    for value, designator in ((weeks, "W"), (years, "Y"), (months, "M"), (days, "D")):
+        if value:
+            parts.append(format_number(value * global_sign) + designator)
+
+    if hours or minutes or seconds:
+        parts.append(TIME_PREFIX)
+        for value, designator in ((hours, "H"), (minutes, "M"), (seconds, "S")):
+            if value:
+                parts.append(format_number(value * global_sign) + designator)
+
+    return "".join(parts)
+
+
+def format_durations(
+    years: Optional[Iterable[Any]] = None,
+    months: Optional[Iterable[Any]] = None,
+    days: Optional[Iterable[Any]] = None,
+    weeks: Optional[Iterable[Any]] = None,
+    hours: Optional[Iterable[Any]] = None,
+    minutes: Optional[Iterable[Any]] = None,
+    seconds: Optional[Iterable[Any]] = None,
+) -> List[Optional[str]]:
+    """
+    Format arrays of duration components to ISO 8601 strings, one per row.
+
+    Omitted components are zero. Rows with a missing component (None, NaN) give
+    None. Repeated rows of numbers hit the cache of format_components.
+    """
+    columns = (years, months, days, weeks, hours, minutes, seconds)
+    if all(column is None for column in columns):
+        return []
+
+    result: List[Optional[str]] = []
+    for row in zip(*(repeat(0) if column is None else column for column in columns)):
+        if any(value is None or value != value for value in row):
+            result.append(None)
+        else:
+            result.append(format_components(*row))
+
+    return result
+
+
+def format_number(value: Number) -> str:
+    # Decimals keep their digits, the same way format_duration writes them.
+    if isinstance(value, Decimal):
+        return f"{value:g}"
+    integer = int(value)
+    if integer == value:
+        return str(integer)
+
+    # Shortest repr of the float, without exponent, e.g. 0.5 or 0.00001.
+    return f"{Decimal(repr(float(value))).normalize():f}"
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal
-from typing import TYPE_CHECKING
-
-from isoduration.operations.util import max_day_in_month, mod2, mod3, quot2, quot3
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from isoduration.operations.util import (
+    date_ordinal,
+    days_in_month,
+    max_day_in_month,
+    mod2,
+    mod3,
+    quot2,
+    quot3,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from isoduration.types import Duration
@@ -13,6 +21,143 @@ if TYPE_CHECKING:  # pragma: no cover
 def add(start: datetime, duration: Duration) -> datetime:
     """
     https://www.w3.org/TR/xmlschema-2/#adding-durations-to-dateTimes
+
+    Durations with integral components are added with int arithmetic, Decimal is
+    only used when some component is fractional.
+    """
+    components = integral_components(duration)
+    if components is None:
+        return add_decimal(start, duration)
+
+    years, months, days, weeks, hours, minutes, seconds = components
+
+    # Months and years, the day is clamped to the last day of the end month.
+    # This date may be out of datetime range when days bring it back.
+    end_year, end_month = divmod(
+        start.year * 12 + start.month - 1 + years * 12 + months, 12
+    )
+    end_month += 1
+    end_day = min(start.day, days_in_month(end_year, end_month))
+
+    # Days and time carry over month and year boundaries like the calendar does.
+    try:
+        return start.replace(year=1, month=1, day=1) + timedelta(
+            days=date_ordinal(end_year, end_month, end_day) - 1 + days + 7 * weeks,
+            hours=hours,
+            minutes=minutes,
+            seconds=seconds,
+        )
+    except OverflowError as exc:
+        raise ValueError("date value out of range") from exc
+
+
+def add_many(datetimes: Any, duration: Duration) -> Any:
+    """
+    Add the same duration to every datetime.
+
+    A pandas Series or DatetimeIndex and a numpy datetime64 array are shifted with
+    one vectorized pandas DateOffset when the duration is integral and the result
+    has the same type. Any other iterable gives a list. Missing values (None,
+    NaT) are passed through.
+    """
+    components = integral_components(duration)
+    if components is None or not is_datetime_array(datetimes):
+        return [add_or_missing(start, duration) for start in iter_datetimes(datetimes)]
+
+    import pandas
+
+    years, months, days, weeks, hours, minutes, seconds = components
+    offset = pandas.DateOffset(
+        years=years,
+        months=months,
+        days=days + 7 * weeks,
+        hours=hours,
+        minutes=minutes,
+        seconds=seconds,
+    )
+    if hasattr(datetimes, "to_numpy"):
+        return datetimes + offset
+    return (pandas.DatetimeIndex(datetimes) + offset).to_numpy()
+
+
+def add_each(datetimes: Any, durations: Iterable[Duration]) -> Any:
+    """
+    Add durations to datetimes pairwise.
+
+    Datetime arrays are grouped by distinct duration and every group is shifted
+    with add_many, a pandas Series stays a Series and a numpy array stays an
+    array. Any other iterable gives a list.
+    """
+    if not is_datetime_array(datetimes):
+        return [
+            add_or_missing(start, duration)
+            for start, duration in zip(datetimes, durations)
+        ]
+
+    import pandas
+
+    starts = pandas.Series(datetimes).reset_index(drop=True)
+    positions: Dict[Duration, List[int]] = {}
+    for position, duration in enumerate(durations):
+        positions.setdefault(duration, []).append(position)
+    if not positions:
+        return datetimes[:0]
+
+    # Groups are shifted separately and put back in their original order.
+    result = pandas.concat(
+        [
+            pandas.Series(add_many(starts.iloc[group], duration), index=group)
+            for duration, group in positions.items()
+        ]
+    ).sort_index()
+    if isinstance(datetimes, pandas.Series):
+        result.index = datetimes.index[: len(result)]
+        return result
+    return result.to_numpy()
+
+
+def add_or_missing(start: Any, duration: Duration) -> Any:
+    # NaT is the only datetime which is not equal to itself.
+    if start is None or start != start:
+        return start
+    return add(start, duration)
+
+
+def integral_components(duration: Duration) -> Optional[Tuple[int, ...]]:
+    date, time = duration.date, duration.time
+    components = (
+        date.years,
+        date.months,
+        date.days,
+        date.weeks,
+        time.hours,
+        time.minutes,
+        time.seconds,
+    )
+    try:
+        integers = tuple(map(int, components))
+    except (ValueError, OverflowError):
+        return None
+
+    return integers if integers == components else None
+
+
+def is_datetime_array(values: Any) -> bool:
+    return getattr(getattr(values, "dtype", None), "kind", None) == "M"
+
+
+def iter_datetimes(values: Any) -> Iterable[Any]:
+    if not is_datetime_array(values) or hasattr(values, "to_numpy"):
+        return values
+
+    import pandas
+
+    return pandas.DatetimeIndex(values)
+
+
+def add_decimal(start: datetime, duration: Duration) -> datetime:
+    """
+    https://www.w3.org/TR/xmlschema-2/#adding-durations-to-dateTimes
     """
 
     # Months.
@@ -39,3 +39,32 @@ def max_day_in_month(year: Decimal, month: Decimal) -> Decimal:
         return Decimal(29)
 
     return Decimal(28)
+
+
+def days_in_month(year: int, month: int) -> int:
+    if month in (1, 3, 5, 7, 8, 10, 12):
+        return 31
+    if month in (4, 6, 9, 11):
+        return 30
+
+    if year % 400 == 0 or year % 100 != 0 and year % 4 == 0:
+        return 29
+
+    return 28
+
+
+def date_ordinal(year: int, month: int, day: int) -> int:
+    """
+    Proleptic Gregorian ordinal of the date, as date.toordinal() but for any year.
+    """
+    previous_year = year - 1
+    ordinal = (
+        previous_year * 365
+        + previous_year // 4
+        - previous_year // 100
+        + previous_year // 400
+    )
+    for previous_month in range(1, month):
+        ordinal += days_in_month(year, previous_month)
+
+    return ordinal + day
@@ -1,14 +1,106 @@
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from isoduration.constants import PARSE_CACHE_SIZE
 from isoduration.parser.exceptions import EmptyDuration
 from isoduration.parser.parsing import parse_date_duration
 from isoduration.parser.util import is_period
 from isoduration.parser.validation import validate_fractional
-from isoduration.types import Duration
+from isoduration.types import CompactDuration, DateDuration, Duration, TimeDuration
+
+# Integral durations with designators in the canonical order, e.g. P1W, P1DT4H, -PT30M.
+FAST_DURATION_RE = re.compile(
+    r"([+-]?)P"
+    r"(?:([0-9]+)Y)?(?:([0-9]+)M)?(?:([0-9]+)D)?(?:([0-9]+)W)?"
+    r"(?:T(?=[0-9])(?:([0-9]+)H)?(?:([0-9]+)M)?(?:([0-9]+)S)?)?"
+)
+
+# The same with fractional seconds, e.g. PT1M30.5S.
+COMPACT_DURATION_RE = re.compile(
+    r"([+-]?)P"
+    r"(?:([0-9]+)Y)?(?:([0-9]+)M)?(?:([0-9]+)D)?(?:([0-9]+)W)?"
+    r"(?:T(?=[0-9])(?:([0-9]+)H)?(?:([0-9]+)M)?(?:([0-9]+)(?:[.,]([0-9]{1,6}))?S)?)?"
+)
+
+DurationComponents = Tuple[
+    Decimal, Decimal, Decimal, Decimal, Decimal, Decimal, Decimal
+]
 
 
 def parse_duration(duration_str: str) -> Duration:
+    years, months, days, weeks, hours, minutes, seconds = parse_components(duration_str)
+
+    return Duration(
+        DateDuration(years=years, months=months, days=days, weeks=weeks),
+        TimeDuration(hours=hours, minutes=minutes, seconds=seconds),
+    )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_components(duration_str: str) -> DurationComponents:
+    """
+    Parse duration into (years, months, days, weeks, hours, minutes, seconds).
+
+    Durations come from a small set of distinct strings, so results are cached.
+    Components are immutable Decimals, and every caller gets its own Duration.
+    """
     if len(duration_str) < 2:
         raise EmptyDuration("No duration information provided")
 
+    components = parse_fast(duration_str)
+    if components is not None:
+        return components
+
+    parsed_duration = parse_full(duration_str)
+
+    return (
+        parsed_duration.date.years,
+        parsed_duration.date.months,
+        parsed_duration.date.days,
+        parsed_duration.date.weeks,
+        parsed_duration.time.hours,
+        parsed_duration.time.minutes,
+        parsed_duration.time.seconds,
+    )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_compact_duration(duration_str: str) -> CompactDuration:
+    """
+    Parse duration into CompactDuration, without Decimal components for
+    integral durations and durations with fractional seconds.
+    """
+    match = COMPACT_DURATION_RE.fullmatch(duration_str)
+    if match is None or len(duration_str) < 2:
+        return CompactDuration.from_components(*parse_components(duration_str))
+
+    sign = -1 if match.group(1) == "-" else +1
+    *values, fraction = match.groups()[1:]
+    microseconds = 0 if fraction is None else int(fraction.ljust(6, "0"))
+
+    return CompactDuration(
+        *(0 if value is None else sign * int(value) for value in values),
+        sign * microseconds,
+    )
+
+
+def parse_fast(duration_str: str) -> Optional[DurationComponents]:
+    match = FAST_DURATION_RE.fullmatch(duration_str)
+    if match is None:
+        return None
+
+    sign = -1 if match.group(1) == "-" else +1
+    years, months, days, weeks, hours, minutes, seconds = (
+        Decimal(0) if value is None else sign * Decimal(value)
+        for value in match.groups()[1:]
+    )
+
+    return years, months, days, weeks, hours, minutes, seconds
+
+
+def parse_full(duration_str: str) -> Duration:
     beginning = 1
     first = duration_str[beginning - 1]
 
@@ -1,8 +1,6 @@
 from collections import OrderedDict
 from decimal import Decimal, InvalidOperation
 
-import arrow
-
 from isoduration.parser.exceptions import (
     IncorrectDesignator,
     NoTime,
@@ -19,8 +17,13 @@ from isoduration.parser.util import (
 )
 from isoduration.types import DateDuration, Duration, TimeDuration
 
+DATE_DESIGNATORS = {"Y": "years", "M": "months", "D": "days", "W": "weeks"}
+
 
 def parse_datetime_duration(duration_str: str, sign: int) -> Duration:
+    # arrow is imported only for the rare alternative format of durations
+    import arrow
+
     try:
         duration: arrow.Arrow = arrow.get(duration_str)
     except (arrow.ParserError, ValueError):
@@ -61,16 +64,14 @@ def parse_date_duration(date_str: str, sign: int) -> Duration:
             return Duration(duration, parse_time_duration(time_str, sign))
 
         if is_letter(ch):
-            try:
-                date_designators = OrderedDict(
-                    (("Y", "years"), ("M", "months"), ("D", "days"), ("W", "weeks"))
-                )
-                key = parse_designator(date_designators, ch)
-                value = sign * Decimal(tmp_value)
-            except OutOfDesignators as exc:
+            # Date designators may come in any order, only the letter is checked.
+            if ch not in DATE_DESIGNATORS:
                 raise IncorrectDesignator(
                     f"Wrong date designator, or designator in the wrong order: {ch}"
-                ) from exc
+                )
+            key = DATE_DESIGNATORS[ch]
+            try:
+                value = sign * Decimal(tmp_value)
             except InvalidOperation as exc:
                 raise UnparseableValue(
                     f"Value could not be parsed as decimal: {tmp_value}"
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Iterator, Tuple
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Tuple
 
 from isoduration.formatter import format_duration
 from isoduration.operations import add
 
+if TYPE_CHECKING:  # pragma: no cover
+    from isoduration.working_time import WorkingCalendar
+
 
 @dataclass
 class DateDuration:
@@ -112,3 +115,95 @@ class Duration:
             return -self + other
 
         raise NotImplementedError
+
+
+class CompactDuration(NamedTuple):
+    """
+    Immutable duration with integer components, seconds are split into whole
+    seconds and microseconds. Being a tuple, it has no per-instance dict and
+    is hashed and compared by value.
+    """
+
+    years: int = 0
+    months: int = 0
+    days: int = 0
+    weeks: int = 0
+    hours: int = 0
+    minutes: int = 0
+    seconds: int = 0
+    microseconds: int = 0
+
+    @classmethod
+    def from_components(
+        cls,
+        years: Decimal,
+        months: Decimal,
+        days: Decimal,
+        weeks: Decimal,
+        hours: Decimal,
+        minutes: Decimal,
+        seconds: Decimal,
+    ) -> CompactDuration:
+        # Fractional hours and minutes are carried to the next unit, a fraction
+        # of a date component has no fixed length in smaller units.
+        for value in (years, months, days, weeks):
+            if value != int(value):
+                raise ValueError(f"Fractional date component: {value}")
+
+        minutes += (hours - int(hours)) * 60
+        seconds += (minutes - int(minutes)) * 60
+        microseconds = round((seconds - int(seconds)) * 1_000_000)
+
+        return cls(
+            int(years),
+            int(months),
+            int(days),
+            int(weeks),
+            int(hours),
+            int(minutes),
+            int(seconds),
+            microseconds,
+        )
+
+    @classmethod
+    def from_duration(cls, duration: Duration) -> CompactDuration:
+        return cls.from_components(*(value for _, value in duration))
+
+    def to_duration(self) -> Duration:
+        return Duration(
+            DateDuration(
+                years=Decimal(self.years),
+                months=Decimal(self.months),
+                days=Decimal(self.days),
+                weeks=Decimal(self.weeks),
+            ),
+            TimeDuration(
+                hours=Decimal(self.hours),
+                minutes=Decimal(self.minutes),
+                seconds=Decimal(self.seconds) + Decimal(self.microseconds).scaleb(-6),
+            ),
+        )
+
+    def to_timedelta(self) -> timedelta:
+        if self.years or self.months:
+            raise ValueError("Years and months have no fixed length")
+
+        return timedelta(
+            weeks=self.weeks,
+            days=self.days,
+            hours=self.hours,
+            minutes=self.minutes,
+            seconds=self.seconds,
+            microseconds=self.microseconds,
+        )
+
+    def total_minutes(self, calendar: WorkingCalendar) -> float:
+        return (
+            self.years * calendar.minutes_per_year
+            + self.months * calendar.minutes_per_month
+            + self.weeks * calendar.minutes_per_week
+            + self.days * calendar.minutes_per_day
+            + self.hours * 60
+            + self.minutes
+            + (self.seconds + self.microseconds / 1_000_000) / 60
+        )
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from numbers import Real
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from isoduration.formatter import format_components
+from isoduration.parser import parse_components
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
+
+@dataclass(frozen=True)
+class WorkingCalendar:
+    hours_per_day: float = 8
+    days_per_week: float = 5
+    days_per_month: float = 20
+    months_per_year: float = 12
+
+    @property
+    def minutes_per_day(self) -> float:
+        return 60 * self.hours_per_day
+
+    @property
+    def minutes_per_week(self) -> float:
+        return self.minutes_per_day * self.days_per_week
+
+    @property
+    def minutes_per_month(self) -> float:
+        return self.minutes_per_day * self.days_per_month
+
+    @property
+    def minutes_per_year(self) -> float:
+        return self.minutes_per_month * self.months_per_year
+
+
+DEFAULT_CALENDAR = WorkingCalendar()
+
+
+def duration_to_minutes(
+    duration_str: str, calendar: WorkingCalendar = DEFAULT_CALENDAR
+) -> float:
+    years, months, days, weeks, hours, minutes, seconds = parse_components(duration_str)
+
+    return (
+        float(years) * calendar.minutes_per_year
+        + float(months) * calendar.minutes_per_month
+        + float(weeks) * calendar.minutes_per_week
+        + float(days) * calendar.minutes_per_day
+        + float(hours) * 60
+        + float(minutes)
+        + float(seconds) / 60
+    )
+
+
+def durations_to_minutes(
+    durations: Iterable[Any],
+    calendar: WorkingCalendar = DEFAULT_CALENDAR,
+    missing: float = 0.0,
+) -> Union[List[float], numpy.ndarray]:
+    """
+    Convert ISO 8601 durations to working minutes of the calendar.
+
+    Every distinct duration is parsed once and the result is broadcast to all
+    its occurrences. Values which are not strings (None, NaN) count as missing.
+    A pandas Series is factorized and a numpy array is returned, any other
+    iterable gives a list.
+    """
+    factorize = getattr(durations, "factorize", None)
+    if factorize is not None:
+        import numpy
+
+        codes, uniques = factorize()
+        # Code -1 marks missing values and picks the last element.
+        unique_minutes = [
+            minutes_or_missing(value, calendar, missing) for value in uniques
+        ]
+        unique_minutes.append(missing)
+        return numpy.asarray(unique_minutes, dtype="float64")[codes]
+
+    cache: Dict[Any, float] = {}
+    result = []
+    for value in durations:
+        try:
+            result.append(cache[value])
+        except KeyError:
+            result.append(
+                cache.setdefault(value, minutes_or_missing(value, calendar, missing))
+            )
+        except TypeError:
+            result.append(missing)
+
+    return result
+
+
+def minutes_or_missing(value: Any, calendar: WorkingCalendar, missing: float) -> float:
+    if not isinstance(value, str):
+        return missing
+
+    return duration_to_minutes(value, calendar)
+
+
+def minutes_to_duration(
+    minutes: float, calendar: WorkingCalendar = DEFAULT_CALENDAR
+) -> str:
+    """
+    Convert working minutes of the calendar to an ISO 8601 duration, which
+    duration_to_minutes converts back to the same minutes.
+
+    Whole weeks are written as weeks, anything else as days, hours, minutes and
+    seconds rounded to milliseconds.
+    """
+    milliseconds = round(minutes * 60000)
+    sign = -1 if milliseconds < 0 else 1
+    milliseconds = abs(milliseconds)
+
+    week_milliseconds = round(calendar.minutes_per_week * 60000)
+    if week_milliseconds and milliseconds % week_milliseconds == 0:
+        return format_components(weeks=sign * (milliseconds // week_milliseconds))
+
+    days, milliseconds = divmod(milliseconds, round(calendar.minutes_per_day * 60000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    whole_minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds = milliseconds // 1000 if milliseconds % 1000 == 0 else milliseconds / 1000
+
+    return format_components(
+        days=sign * days,
+        hours=sign * hours,
+        minutes=sign * whole_minutes,
+        seconds=sign * seconds,
+    )
+
+
+def minutes_to_durations(
+    minutes: Iterable[Any], calendar: WorkingCalendar = DEFAULT_CALENDAR
+) -> Union[List[Optional[str]], numpy.ndarray]:
+    """
+    Convert working minutes of the calendar to ISO 8601 durations in bulk.
+
+    Every distinct value is formatted once, values which are not numbers (None,
+    NaN) give None. A pandas Series is factorized and a numpy array of objects
+    is returned, any other iterable gives a list.
+    """
+    factorize = getattr(minutes, "factorize", None)
+    if factorize is not None:
+        import numpy
+
+        codes, uniques = factorize()
+        # Code -1 marks missing values and picks the last element.
+        unique_durations = [duration_or_missing(value, calendar) for value in uniques]
+        unique_durations.append(None)
+        return numpy.asarray(unique_durations, dtype="object")[codes]
+
+    cache: Dict[Any, Optional[str]] = {}
+    result = []
+    for value in minutes:
+        try:
+            result.append(cache[value])
+        except KeyError:
+            result.append(cache.setdefault(value, duration_or_missing(value, calendar)))
+        except TypeError:
+            result.append(None)
+
+    return result
+
+
+def duration_or_missing(value: Any, calendar: WorkingCalendar) -> Optional[str]:
+    if not isinstance(value, Real) or value != value:
+        return None
+
+    return minutes_to_duration(value, calendar)
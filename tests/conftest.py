@@ -0,0 +1,32 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loader reads these at import, tests don't call Tracker or ClickHouse.
+for env_name in (
+    "TRACKER_ORG_ID",
+    "TRACKER_OAUTH_TOKEN",
+    "CH_HOST",
+    "CH_DB",
+    "CH_USER",
+    "CH_PASSWORD",
+):
+    os.environ.setdefault(env_name, "test")
+os.environ.setdefault("CH_ISSUES_TABLE", "tracker_issues")
+os.environ.setdefault("CH_CHANGELOG_TABLE", "tracker_changelog")
+
+
+@pytest.fixture(scope="session")
+def ti():
+    """
+    tracker-import.py loaded as module, its file name is not a valid module name.
+    """
+    spec = importlib.util.spec_from_file_location(
+        "tracker_import", os.path.join(ROOT_DIR, "tracker-import.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,70 @@
+"""
+Random inputs and differential checks shared by the tests of isoduration fast paths,
+every fast path is compared with the reference implementation on seeded random input.
+"""
+
+import random
+from typing import Callable, Sequence, Tuple, Type
+
+
+def random_duration_str(
+    rng: random.Random,
+    date_designators: str = "YMDW",
+    time_designators: str = "HMS",
+    max_digits: int = 6,
+    fractional_seconds: bool = False,
+    signs: Sequence[str] = ("", "+", "-"),
+) -> str:
+    """
+    ISO 8601 duration with random subset of components, each present with probability 0.4,
+    integer values have up to max_digits digits, seconds optionally have a fraction.
+    """
+
+    def value() -> str:
+        return str(rng.randint(0, 10 ** rng.randint(1, max_digits)))
+
+    date = "".join(
+        value() + designator for designator in date_designators if rng.random() < 0.4
+    )
+    time = ""
+    for designator in time_designators:
+        if rng.random() >= 0.4:
+            continue
+        number = value()
+        if designator == "S" and fractional_seconds and rng.random() < 0.5:
+            number += (
+                rng.choice(".,")
+                + str(rng.randint(0, 999999)).zfill(6)[: rng.randint(1, 6)]
+            )
+        time += number + designator
+    if not date and not time:
+        date = f"{rng.randint(0, 100)}D"
+
+    return rng.choice(signs) + "P" + date + ("T" + time if time else "")
+
+
+def assert_same_results(
+    function: Callable,
+    reference: Callable,
+    generate: Callable[[random.Random], Tuple],
+    seed: int,
+    iterations: int = 20000,
+    errors: Tuple[Type[Exception], ...] = (),
+) -> None:
+    """
+    Check function against reference on arguments drawn by generate from RNG seeded
+    with seed, raising one of errors counts as returning that error class.
+    """
+
+    def result(call: Callable, args: Tuple):
+        try:
+            return call(*args)
+        except errors as error:
+            return next(
+                error_class for error_class in errors if isinstance(error, error_class)
+            )
+
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        args = generate(rng)
+        assert result(function, args) == result(reference, args), args
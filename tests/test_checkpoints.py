@@ -0,0 +1,27 @@
+def test_reset_load_state_forgets_watermark_and_checkpoint(ti, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ti, "TRACKER_CHECKPOINT_FILE", str(tmp_path / "checkpoint.json")
+    )
+    ti.write_checkpoint(ti.WATERMARK_NAME, "2023-01-01 00:00:00.000", "file")
+    ti.write_checkpoint(ti.CHECKPOINT_NAME, {"state": "running"}, "file")
+    ti.write_checkpoint("other", "kept", "file")
+
+    ti.reset_load_state("file")
+
+    assert ti.read_checkpoint(ti.WATERMARK_NAME, "file") is None
+    assert ti.LoadCheckpoint.resume(backend="file") is None
+    assert ti.read_checkpoint("other", "file") == "kept"
+
+
+def test_watermark_moves_after_reset(ti, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ti, "TRACKER_CHECKPOINT_FILE", str(tmp_path / "checkpoint.json")
+    )
+    ti.write_checkpoint(ti.WATERMARK_NAME, "2024-01-01 00:00:00.000", "file")
+    ti.reset_load_state("file")
+
+    checkpoint = ti.LoadCheckpoint(["query"], backend="file")
+    checkpoint.latest_updated_at = "2023-01-01 00:00:00.000"
+    checkpoint.finish()
+
+    assert ti.read_checkpoint(ti.WATERMARK_NAME, "file") == "2023-01-01 00:00:00.000"
@@ -0,0 +1,74 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from isoduration import (
+    CompactDuration,
+    WorkingCalendar,
+    duration_to_minutes,
+    parse_compact_duration,
+)
+from isoduration.parser import parse_components
+
+from helpers import assert_same_results, random_duration_str
+
+
+def random_compact_duration_str(rng: random.Random) -> str:
+    return random_duration_str(
+        rng,
+        date_designators="YMD",
+        max_digits=4,
+        fractional_seconds=True,
+        signs=("", "-"),
+    )
+
+
+def test_compact_parser_matches_decimal_components():
+    assert_same_results(
+        parse_compact_duration,
+        lambda duration_str: CompactDuration.from_components(
+            *parse_components(duration_str)
+        ),
+        lambda rng: (random_compact_duration_str(rng),),
+        seed=22,
+    )
+
+
+@pytest.mark.parametrize("duration_str", ["PT1.5H", "PT0,25M", "-PT1.5M", "PT90.5M"])
+def test_fractional_hours_and_minutes_carry_to_smaller_units(duration_str):
+    assert parse_compact_duration(duration_str).to_timedelta() == timedelta(
+        minutes=duration_to_minutes(duration_str)
+    )
+
+
+def test_fractional_date_components_raise():
+    with pytest.raises(ValueError):
+        parse_compact_duration("P1.5D")
+
+
+def test_round_trip_through_duration():
+    rng = random.Random(220)
+    for _ in range(2000):
+        compact = parse_compact_duration(random_compact_duration_str(rng))
+
+        assert CompactDuration.from_duration(compact.to_duration()) == compact
+
+
+def test_total_minutes_match_duration_to_minutes():
+    rng = random.Random(221)
+    calendar = WorkingCalendar(hours_per_day=7, days_per_week=4)
+    for _ in range(2000):
+        duration_str = random_compact_duration_str(rng)
+
+        assert parse_compact_duration(duration_str).total_minutes(
+            calendar
+        ) == pytest.approx(duration_to_minutes(duration_str, calendar))
+
+
+def test_to_timedelta():
+    assert parse_compact_duration("P1W2DT3H4M5.5S").to_timedelta() == timedelta(
+        weeks=1, days=2, hours=3, minutes=4, seconds=5.5
+    )
+    with pytest.raises(ValueError):
+        parse_compact_duration("P1M").to_timedelta()
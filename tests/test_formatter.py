@@ -0,0 +1,143 @@
+import math
+import random
+from decimal import Decimal
+
+import pytest
+
+from isoduration import (
+    DurationFormattingException,
+    WorkingCalendar,
+    duration_to_minutes,
+    format_components,
+    format_duration,
+    format_durations,
+    minutes_to_duration,
+    minutes_to_durations,
+    parse_duration,
+)
+from isoduration.types import DateDuration, Duration, TimeDuration
+
+from helpers import assert_same_results
+
+
+def random_components(rng: random.Random) -> tuple:
+    def component() -> Decimal:
+        if rng.random() < 0.5:
+            return Decimal(0)
+        value = Decimal(rng.randint(0, 10000))
+        if rng.random() < 0.2:
+            value += Decimal(rng.randint(1, 999)).scaleb(-3)
+        return value * rng.choice((1, 1, -1))
+
+    years, months, days, hours, minutes, seconds = (component() for _ in range(6))
+    weeks = component() if rng.random() < 0.2 else Decimal(0)
+    if weeks:
+        years = months = days = Decimal(0)
+
+    return years, months, days, weeks, hours, minutes, seconds
+
+
+def format_components_as_duration(
+    years, months, days, weeks, hours, minutes, seconds
+) -> str:
+    return format_duration(
+        Duration(
+            DateDuration(years=years, months=months, days=days, weeks=weeks),
+            TimeDuration(hours=hours, minutes=minutes, seconds=seconds),
+        )
+    )
+
+
+def test_format_components_matches_format_duration():
+    assert_same_results(
+        format_components,
+        format_components_as_duration,
+        random_components,
+        seed=24,
+        errors=(DurationFormattingException,),
+    )
+
+
+@pytest.mark.parametrize(
+    "components, expected",
+    [
+        ({}, "P0D"),
+        ({"weeks": 2}, "P2W"),
+        ({"days": -1, "hours": -2}, "-P1DT2H"),
+        ({"days": 1, "hours": -2}, "P1DT-2H"),
+        ({"minutes": 0.5}, "PT0.5M"),
+        ({"seconds": 1e-05}, "PT0.00001S"),
+    ],
+)
+def test_format_components(components, expected):
+    assert format_components(**components) == expected
+
+
+def test_format_components_with_weeks_and_days_raises():
+    with pytest.raises(DurationFormattingException):
+        format_components(days=1, weeks=1)
+
+
+def test_format_durations_leaves_missing_rows_empty():
+    assert format_durations(days=[1, None, 2, float("nan")], hours=[0, 1, None, 3]) == [
+        "P1D",
+        None,
+        None,
+        None,
+    ]
+    assert format_durations() == []
+
+
+@pytest.mark.parametrize(
+    "calendar",
+    [WorkingCalendar(), WorkingCalendar(hours_per_day=7.5, days_per_week=4)],
+)
+def test_minutes_to_duration_round_trip(calendar):
+    rng = random.Random(240)
+    for _ in range(20000):
+        minutes = rng.choice(
+            (
+                rng.randint(-100000, 100000),
+                round(rng.uniform(-100000, 100000), 3),
+                rng.randint(-50, 50) * calendar.minutes_per_week,
+            )
+        )
+
+        duration_str = minutes_to_duration(minutes, calendar)
+        assert duration_to_minutes(duration_str, calendar) == pytest.approx(
+            minutes, abs=1e-6
+        ), duration_str
+        assert parse_duration(duration_str) == parse_duration(
+            minutes_to_duration(duration_to_minutes(duration_str, calendar), calendar)
+        )
+
+
+def test_minutes_to_duration_units():
+    assert minutes_to_duration(2400) == "P1W"
+    assert minutes_to_duration(-480) == "-P1D"
+    assert minutes_to_duration(570) == "P1DT1H30M"
+    assert minutes_to_duration(0.5) == "PT30S"
+    assert minutes_to_duration(0.0125) == "PT0.75S"
+    assert minutes_to_duration(0) == "P0D"
+
+
+def test_minutes_to_durations_leaves_missing_values_empty():
+    pandas = pytest.importorskip("pandas")
+
+    minutes = [480, None, math.nan, 480, 30]
+    expected = ["P1D", None, None, "P1D", "PT30M"]
+    assert minutes_to_durations(minutes) == expected
+    assert list(minutes_to_durations(pandas.Series(minutes, dtype="float64"))) == (
+        expected
+    )
+
+
+@pytest.mark.parametrize(
+    "first, second", [(Decimal("1.0"), 1), (1, Decimal("1.0")), (1.0, Decimal("1"))]
+)
+def test_format_components_does_not_depend_on_call_order(first, second):
+    for seconds in (first, second):
+        duration = Duration(DateDuration(), TimeDuration(seconds=Decimal(seconds)))
+        expected = format_duration(duration) if isinstance(seconds, Decimal) else "PT1S"
+
+        assert format_components(seconds=seconds) == expected
@@ -0,0 +1,135 @@
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from isoduration import parse_duration
+from isoduration.operations import add, add_decimal, add_each, add_many
+from isoduration.types import DateDuration, Duration, TimeDuration
+
+from helpers import assert_same_results
+
+
+def random_datetime(rng: random.Random, low: int = 1, high: int = 9999) -> datetime:
+    return datetime(
+        rng.randint(low, high),
+        rng.randint(1, 12),
+        rng.randint(1, 28) if rng.random() < 0.5 else rng.choice((28, 29, 30, 31)) - 3,
+        rng.randint(0, 23),
+        rng.randint(0, 59),
+        rng.randint(0, 59),
+        rng.choice((0, rng.randint(0, 999999))),
+    )
+
+
+def random_duration(rng: random.Random, years: int = 30) -> Duration:
+    def component(limit: int) -> Decimal:
+        return Decimal(rng.randint(-limit, limit)) if rng.random() < 0.6 else Decimal(0)
+
+    return Duration(
+        DateDuration(
+            years=component(years),
+            months=component(30),
+            days=component(400),
+            weeks=component(60),
+        ),
+        TimeDuration(
+            hours=component(100), minutes=component(1000), seconds=component(100000)
+        ),
+    )
+
+
+def test_add_matches_add_decimal():
+    assert_same_results(
+        add,
+        add_decimal,
+        lambda rng: (random_datetime(rng), random_duration(rng)),
+        seed=23,
+        errors=(ValueError,),
+    )
+
+
+def test_add_matches_add_decimal_near_datetime_range():
+    assert_same_results(
+        add,
+        add_decimal,
+        lambda rng: (
+            random_datetime(rng, *rng.choice(((1, 40), (9960, 9999)))),
+            random_duration(rng, years=40),
+        ),
+        seed=230,
+        iterations=5000,
+        errors=(ValueError,),
+    )
+
+
+def test_add_out_of_range_intermediate_year():
+    start = datetime(19, 2, 28, 12, 0, 0)
+    duration = parse_duration("P-20Y22M29DT-18H-163M-585S")
+
+    assert add(start, duration) == add_decimal(start, duration)
+    assert add(start, duration) == datetime(1, 1, 25, 15, 7, 15)
+
+
+@pytest.mark.parametrize(
+    "start, duration_str, expected",
+    [
+        (datetime(2023, 1, 31), "P1M", datetime(2023, 2, 28)),
+        (datetime(2024, 1, 31), "P1M", datetime(2024, 2, 29)),
+        (datetime(2024, 2, 29), "P1Y", datetime(2025, 2, 28)),
+        (datetime(2023, 3, 31), "-P1M1D", datetime(2023, 2, 27)),
+        (datetime(2023, 12, 31, 23), "PT1H", datetime(2024, 1, 1)),
+    ],
+)
+def test_add(start, duration_str, expected):
+    assert add(start, parse_duration(duration_str)) == expected
+
+
+def test_add_keeps_timezone():
+    start = datetime(2023, 3, 25, 12, tzinfo=timezone(timedelta(hours=3)))
+
+    assert add(start, parse_duration("P1DT1H")) == datetime(
+        2023, 3, 26, 13, tzinfo=timezone(timedelta(hours=3))
+    )
+
+
+def test_add_out_of_range_raises():
+    with pytest.raises(ValueError):
+        add(datetime(9999, 12, 31), parse_duration("P1D"))
+    with pytest.raises(ValueError):
+        add(datetime(1, 1, 1), parse_duration("-PT1S"))
+
+
+def test_add_many_and_add_each_match_add():
+    pandas = pytest.importorskip("pandas")
+
+    rng = random.Random(231)
+    starts = [random_datetime(rng, 1900, 2100) for _ in range(500)]
+    durations = [random_duration(rng) for _ in range(20)]
+    series = pandas.Series(pandas.to_datetime(starts), index=range(10, 510))
+
+    for duration in durations:
+        expected = [add(start, duration) for start in starts]
+        assert list(add_many(series, duration)) == expected
+        assert list(add_many(series.to_numpy(), duration)) == list(
+            pandas.to_datetime(expected).to_numpy()
+        )
+        assert add_many(starts, duration) == expected
+
+    each_durations = [rng.choice(durations) for _ in starts]
+    result = add_each(series, each_durations)
+    assert list(result.index) == list(series.index)
+    assert list(result) == [
+        add(start, duration) for start, duration in zip(starts, each_durations)
+    ]
+
+
+def test_add_many_passes_missing_values_through():
+    pandas = pytest.importorskip("pandas")
+
+    result = add_many([datetime(2023, 1, 1), None, pandas.NaT], parse_duration("P1D"))
+
+    assert result[0] == datetime(2023, 1, 2)
+    assert result[1] is None
+    assert result[2] is pandas.NaT
@@ -0,0 +1,40 @@
+import pytest
+
+from isoduration import DurationParsingException, parse_duration
+from isoduration.parser import parse_components, parse_fast, parse_full
+
+from helpers import assert_same_results, random_duration_str
+
+
+def full_components(duration_str: str) -> tuple:
+    return tuple(value for _, value in parse_full(duration_str))
+
+
+def test_fast_parser_matches_full_parser():
+    assert_same_results(
+        parse_fast, full_components, lambda rng: (random_duration_str(rng),), seed=9
+    )
+
+
+@pytest.mark.parametrize(
+    "duration_str",
+    ["P1.5D", "PT0.5H", "PT1M30.25S", "-P1,5Y", "P1DT", "PT1S2M", "P1D1Y"],
+)
+def test_fast_parser_leaves_other_durations_to_full_parser(duration_str):
+    assert parse_fast(duration_str) is None
+
+
+@pytest.mark.parametrize("duration_str", ["P1.5D", "PT0.5H", "PT1M30.25S", "-P1,5Y"])
+def test_fractional_durations_are_parsed_by_full_parser(duration_str):
+    assert parse_components(duration_str) == full_components(duration_str)
+
+
+@pytest.mark.parametrize("duration_str", ["", "P", "1D", "PT", "P1DT", "PxD"])
+def test_invalid_durations_raise(duration_str):
+    with pytest.raises(DurationParsingException):
+        parse_duration(duration_str)
+
+
+def test_parsed_durations_are_not_shared():
+    assert parse_duration("P1D") == parse_duration("P1D")
+    assert parse_duration("P1D") is not parse_duration("P1D")
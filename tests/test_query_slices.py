@@ -0,0 +1,26 @@
+from datetime import datetime
+
+
+def test_backfill_is_not_sliced_by_default(ti):
+    assert ti.get_backfill_query_texts("1y", 1) == ["updated: >now()-1y"]
+
+
+def test_backfill_is_sliced_into_shards(ti):
+    query_texts = ti.get_backfill_query_texts(
+        "4d", 4, now=datetime(2023, 1, 5), slice_hours=0
+    )
+
+    assert query_texts == [
+        'updated: >now()-4d AND updated: < "2023-01-02 00:00:00"',
+        'updated: >= "2023-01-02 00:00:00" AND updated: < "2023-01-03 00:00:00"',
+        'updated: >= "2023-01-03 00:00:00" AND updated: < "2023-01-04 00:00:00"',
+        'updated: >= "2023-01-04 00:00:00"',
+    ]
+
+
+def test_backfill_slices_are_not_longer_than_slice_hours(ti):
+    query_texts = ti.get_backfill_query_texts(
+        "1y", 2, now=datetime(2023, 1, 1), slice_hours=24
+    )
+
+    assert len(query_texts) == 365
@@ -0,0 +1,226 @@
+import math
+import random
+import struct
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_DOWN, Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Default CH_DATE_TIME_TIMEZONE, Europe/Moscow has been UTC+3 since 2014 and in 1970.
+MOSCOW = timezone(timedelta(hours=3))
+
+STRINGS = [
+    "plain",
+    "tab\there",
+    "new\nline",
+    "cr\rlf\n",
+    'quote"q',
+    "back\\slash",
+    "\\t is not a tab",
+    "trailing\\",
+    "юникод",
+    "",
+    None,
+    math.nan,
+    "x" * 16383,
+    "y" * 16384,
+    "ж" * 20000,
+]
+
+
+def read_varint(content, position):
+    value = shift = 0
+    while True:
+        byte = content[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, position
+
+
+def decode_row_binary(content, columns, date_time_columns=(), decimal_columns=()):
+    rows = []
+    position = 0
+    while position < len(content):
+        row = {}
+        for column in columns:
+            if column in date_time_columns or column in decimal_columns:
+                row[column] = struct.unpack_from("<q", content, position)[0]
+                position += 8
+            else:
+                length, position = read_varint(content, position)
+                row[column] = content[position : position + length].decode("utf-8")
+                position += length
+        rows.append(row)
+    return rows
+
+
+def decode_tsv(content, date_time_columns=(), decimal_columns=()):
+    """
+    Read TabSeparatedWithNames the way ClickHouse does: backslash escapes the next
+    character, DateTime64(3) text is time in column time zone, extra digits of
+    Decimal(15,2) are truncated.
+    """
+    escapes = {"t": "\t", "n": "\n", "r": "\r", "0": "\0"}
+    text = content.decode("utf-8")
+    lines = [[]]
+    field = []
+    position = 0
+    while position < len(text):
+        char = text[position]
+        position += 1
+        if char == "\\":
+            char = escapes.get(text[position], text[position])
+            position += 1
+        elif char in "\t\n":
+            lines[-1].append("".join(field))
+            field = []
+            if char == "\n":
+                lines.append([])
+            continue
+        field.append(char)
+
+    columns = lines[0]
+    rows = []
+    for line in lines[1:-1]:
+        row = dict(zip(columns, line))
+        for column in date_time_columns:
+            row[column] = to_epoch_millis(row[column])
+        for column in decimal_columns:
+            row[column] = to_decimal64(row[column])
+        rows.append(row)
+    return rows
+
+
+def to_epoch_millis(value):
+    date_time = datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f")
+    return round(date_time.replace(tzinfo=MOSCOW).timestamp() * 1000)
+
+
+def to_decimal64(value):
+    if value == "":
+        return 0
+    return int(Decimal(value).quantize(Decimal("0.01"), ROUND_DOWN).scaleb(2))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0, b"\x00"),
+        (127, b"\x7f"),
+        (128, b"\x80\x01"),
+        (16383, b"\xff\x7f"),
+        (16384, b"\x80\x80\x01"),
+        (2**21, b"\x80\x80\x80\x01"),
+    ],
+)
+def test_encode_varint(ti, value, expected):
+    assert ti.encode_varint(value) == expected
+    if value < len(ti.VARINT_CACHE):
+        assert ti.VARINT_CACHE[value] == expected
+
+
+def test_strings(ti):
+    df = pd.DataFrame({"a": STRINGS, "b": [1, 2.5, "3"] * 5})
+
+    rows = decode_row_binary(ti.encode_row_binary(df), ["a", "b"])
+
+    assert [row["a"] for row in rows] == [
+        value if isinstance(value, str) else "" for value in STRINGS
+    ]
+    assert [row["b"] for row in rows] == ["1", "2.5", "3"] * 5
+
+
+def test_decimals(ti):
+    numbers = [1.5, -2.25, 0.29, 0.015, 1 / 60, -1 / 60, 2.675, 1e6, 0, None, "3.1"]
+    df = pd.DataFrame({"n": pd.Series(numbers, dtype=object)})
+
+    content = ti.encode_row_binary(df, decimal_columns=["n"])
+
+    assert [row["n"] for row in decode_row_binary(content, ["n"], (), ["n"])] == [
+        150,
+        -225,
+        29,
+        1,
+        1,
+        -1,
+        267,
+        100000000,
+        0,
+        0,
+        310,
+    ]
+
+
+def test_date_times(ti):
+    values = [
+        "1970-01-01 00:00:00.000",
+        "2023-06-01 12:00:00.123",
+        "2000-02-29 23:59:59.999",
+    ]
+    df = pd.DataFrame({"d": values})
+
+    content = ti.encode_row_binary(df, date_time_columns=["d"])
+
+    assert [row["d"] for row in decode_row_binary(content, ["d"], ["d"])] == [
+        -10800000,
+        1685610000123,
+        951857999999,
+    ]
+
+
+def test_missing_date_times_are_1970_sentinel(ti):
+    normalized = ti.normalize_date_time_column(
+        pd.Series(["2023-06-01T09:00:00.123+0000", None, ""], dtype=object)
+    )
+    df = pd.DataFrame({"d": normalized})
+
+    content = ti.encode_row_binary(df, date_time_columns=["d"])
+
+    assert [row["d"] for row in decode_row_binary(content, ["d"], ["d"])] == [
+        to_epoch_millis("2023-06-01 09:00:00.123"),
+        to_epoch_millis("1970-01-01 00:00:00.000"),
+        to_epoch_millis("1970-01-01 00:00:00.000"),
+    ]
+
+
+def test_tsv_and_row_binary_give_same_values(ti, monkeypatch):
+    rng = random.Random(7)
+    size = 300
+    start = datetime(2020, 1, 1)
+    df = pd.DataFrame(
+        {
+            "s": [rng.choice(STRINGS[:12]) for _ in range(size)],
+            "d": [
+                (start + timedelta(milliseconds=rng.randint(0, 10**11))).strftime(
+                    "%Y-%m-%d %H:%M:%S.%f"
+                )[:23]
+                for _ in range(size)
+            ],
+            "n": [
+                (
+                    rng.choice((None, np.nan, rng.randint(-1000, 1000) / 60))
+                    if rng.random() < 0.3
+                    else round(rng.uniform(-1e5, 1e5), rng.randint(0, 4))
+                )
+                for _ in range(size)
+            ],
+            "t": [rng.choice(STRINGS[:12]) for _ in range(size)],
+        }
+    )
+    columns = list(df.columns)
+
+    monkeypatch.setattr(ti, "CH_INSERT_FORMAT", "RowBinary")
+    content, insert_format, names = ti.serialize_dataframe(df, ["d"], ["n"])
+    assert (insert_format, names) == ("RowBinary", columns)
+    row_binary_rows = decode_row_binary(content, columns, ["d"], ["n"])
+
+    monkeypatch.setattr(ti, "CH_INSERT_FORMAT", "TabSeparatedWithNames")
+    content, insert_format, names = ti.serialize_dataframe(df, ["d"], ["n"])
+    assert (insert_format, names) == ("TabSeparatedWithNames", None)
+    tsv_rows = decode_tsv(content, ["d"], ["n"])
+
+    assert tsv_rows == row_binary_rows
@@ -0,0 +1,217 @@
+import pandas as pd
+import pytest
+
+CREATED_AT = {"Q-1": "2023-01-01 10:00:00.000", "Q-2": "2023-01-02 00:00:00.000"}
+
+
+def status_change(issue_key, updated_at, from_status, to_status, other_field=False):
+    fields = [
+        {
+            "field": {"id": "status", "display": "Статус"},
+            "from": None if from_status is None else {"display": from_status},
+            "to": {"display": to_status},
+        }
+    ]
+    if other_field:
+        fields.insert(0, {"field": {"id": "summary"}, "from": "a", "to": "b"})
+    return {
+        "id": issue_key + "-" + updated_at,
+        "issue": {"key": issue_key},
+        "updatedAt": updated_at + ".000+0000",
+        "type": "IssueWorkflow",
+        "fields": fields,
+    }
+
+
+@pytest.fixture
+def issues_df():
+    return pd.DataFrame(
+        {"key": list(CREATED_AT), "createdAt": list(CREATED_AT.values())}
+    )
+
+
+def transitions(ti, changelog, issues_df, stored_transitions={}):
+    df = ti.shape_status_transitions(changelog, issues_df, stored_transitions)
+    assert list(df.columns) == ti.status_transitions_columns
+    return [
+        (
+            row.issue_key,
+            row.from_status,
+            row.to_status,
+            row.entered_at,
+            row.left_at,
+            row.minutes_in_status,
+            row.minutes_from_created,
+        )
+        for row in df.itertuples()
+    ]
+
+
+def test_first_load(ti, issues_df):
+    # Records of two issues are mixed and out of order, as pages of changelog can be.
+    changelog = [
+        status_change("Q-2", "2023-01-02T01:00:00", None, "Open"),
+        status_change("Q-1", "2023-01-01T12:00:00", "Open", "In progress", True),
+        status_change("Q-1", "2023-01-01T11:00:00", None, "Open"),
+        status_change("Q-2", "2023-01-02T03:30:00", "Open", "Closed"),
+        status_change("Q-1", "2023-01-01T12:30:00", "In progress", "Closed"),
+    ]
+
+    assert transitions(ti, changelog, issues_df) == [
+        (
+            "Q-1",
+            "",
+            "Open",
+            "2023-01-01 10:00:00.000",
+            "2023-01-01 11:00:00.000",
+            60.0,
+            60.0,
+        ),
+        (
+            "Q-1",
+            "Open",
+            "In progress",
+            "2023-01-01 11:00:00.000",
+            "2023-01-01 12:00:00.000",
+            60.0,
+            120.0,
+        ),
+        (
+            "Q-1",
+            "In progress",
+            "Closed",
+            "2023-01-01 12:00:00.000",
+            "2023-01-01 12:30:00.000",
+            30.0,
+            150.0,
+        ),
+        (
+            "Q-2",
+            "",
+            "Open",
+            "2023-01-02 00:00:00.000",
+            "2023-01-02 01:00:00.000",
+            60.0,
+            60.0,
+        ),
+        (
+            "Q-2",
+            "Open",
+            "Closed",
+            "2023-01-02 01:00:00.000",
+            "2023-01-02 03:30:00.000",
+            150.0,
+            210.0,
+        ),
+    ]
+
+
+def test_incremental_batch_follows_stored_transition(ti, issues_df):
+    changelog = [
+        status_change("Q-1", "2023-01-01T13:00:00", "Closed", "Open"),
+        status_change("Q-1", "2023-01-01T13:15:00", "Open", "Closed"),
+        status_change("Q-2", "2023-01-02T05:00:00", "Closed", "Open"),
+    ]
+    stored_transitions = {"Q-1": "2023-01-01 12:30:00.000"}
+
+    assert transitions(ti, changelog, issues_df, stored_transitions) == [
+        (
+            "Q-1",
+            "Closed",
+            "Open",
+            "2023-01-01 12:30:00.000",
+            "2023-01-01 13:00:00.000",
+            30.0,
+            180.0,
+        ),
+        (
+            "Q-1",
+            "Open",
+            "Closed",
+            "2023-01-01 13:00:00.000",
+            "2023-01-01 13:15:00.000",
+            15.0,
+            195.0,
+        ),
+        # Issue without stored transitions entered its status at creation.
+        (
+            "Q-2",
+            "Closed",
+            "Open",
+            "2023-01-02 00:00:00.000",
+            "2023-01-02 05:00:00.000",
+            300.0,
+            300.0,
+        ),
+    ]
+
+
+def test_stored_transition_later_than_first_change(ti, issues_df):
+    # Whole changelog is loaded again, stored transitions are the same or later.
+    changelog = [
+        status_change("Q-1", "2023-01-01T11:00:00", None, "Open"),
+        status_change("Q-1", "2023-01-01T12:00:00", "Open", "Closed"),
+    ]
+    stored_transitions = {"Q-1": "2023-01-01 12:00:00.000"}
+
+    assert transitions(ti, changelog, issues_df, stored_transitions) == [
+        (
+            "Q-1",
+            "",
+            "Open",
+            "2023-01-01 10:00:00.000",
+            "2023-01-01 11:00:00.000",
+            60.0,
+            60.0,
+        ),
+        (
+            "Q-1",
+            "Open",
+            "Closed",
+            "2023-01-01 11:00:00.000",
+            "2023-01-01 12:00:00.000",
+            60.0,
+            120.0,
+        ),
+    ]
+
+
+def test_changelog_loaded_twice(ti, issues_df):
+    changelog = [
+        status_change("Q-1", "2023-01-01T11:00:00", None, "Open"),
+        status_change("Q-1", "2023-01-01T12:00:00", "Open", "Closed"),
+    ]
+
+    assert transitions(ti, changelog + changelog, issues_df) == transitions(
+        ti, changelog, issues_df
+    )
+
+
+def test_issue_missing_from_batch_counts_from_1970(ti, issues_df):
+    changelog = [status_change("Q-3", "1970-01-01T01:00:00", None, "Open")]
+
+    assert transitions(ti, changelog, issues_df) == [
+        (
+            "Q-3",
+            "",
+            "Open",
+            "1970-01-01 00:00:00.000",
+            "1970-01-01 01:00:00.000",
+            60.0,
+            60.0,
+        ),
+    ]
+
+
+def test_no_status_changes(ti, issues_df):
+    changelog = [
+        {
+            "id": "1",
+            "issue": {"key": "Q-1"},
+            "updatedAt": "2023-01-01T11:00:00.000+0000",
+            "fields": [{"field": {"id": "summary"}, "from": "a", "to": "b"}],
+        }
+    ]
+
+    assert transitions(ti, changelog, issues_df) == []
+    assert transitions(ti, [], issues_df) == []
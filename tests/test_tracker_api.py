@@ -0,0 +1,86 @@
+import time
+
+import pytest
+import requests
+
+
+def make_response(**headers):
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+
+@pytest.mark.parametrize(
+    "reset, expected",
+    [("0", 0.0), ("12", 12.0), ("12.5", 12.5), ("-3", 0.0), ("3600", 60.0)],
+)
+def test_rate_limit_reset_seconds(ti, reset, expected):
+    response = make_response(**{"X-RateLimit-Reset": reset})
+
+    assert ti.get_rate_limit_reset(response, max_pause=60.0) == expected
+
+
+def test_rate_limit_reset_epoch_timestamp(ti):
+    response = make_response(**{"X-RateLimit-Reset": str(int(time.time()) + 10)})
+
+    assert 8.0 <= ti.get_rate_limit_reset(response, max_pause=60.0) <= 10.0
+
+
+@pytest.mark.parametrize("seconds_ago", [1, 3600])
+def test_rate_limit_reset_passed_epoch_timestamp(ti, seconds_ago):
+    response = make_response(
+        **{"X-RateLimit-Reset": str(int(time.time()) - seconds_ago)}
+    )
+
+    assert ti.get_rate_limit_reset(response, max_pause=60.0) == 0.0
+
+
+def test_rate_limit_reset_far_epoch_timestamp_is_capped(ti):
+    response = make_response(**{"X-RateLimit-Reset": str(int(time.time()) + 86400)})
+
+    assert ti.get_rate_limit_reset(response, max_pause=60.0) == 60.0
+
+
+@pytest.mark.parametrize("reset", [None, "", "soon"])
+def test_rate_limit_reset_missing_or_malformed(ti, reset):
+    response = (
+        make_response()
+        if reset is None
+        else make_response(**{"X-RateLimit-Reset": reset})
+    )
+
+    assert ti.get_rate_limit_reset(response) is None
+
+
+@pytest.mark.parametrize(
+    "retry_after, expected", [("5", 5.0), ("-1", 0.0), ("7200", 60.0), ("x", None)]
+)
+def test_retry_after_seconds(ti, retry_after, expected):
+    response = make_response(**{"Retry-After": retry_after})
+
+    assert ti.get_retry_after(response, max_pause=60.0) == expected
+
+
+def test_retry_after_http_date(ti):
+    retry_at = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    response = make_response(**{"Retry-After": retry_at})
+
+    assert 28.0 <= ti.get_retry_after(response, max_pause=60.0) <= 30.0
+
+
+def test_failed_changelog_cancels_queued_issues(ti, monkeypatch):
+    loaded = []
+
+    def get_changelog(issue_key, since_id):
+        time.sleep(0.01)
+        loaded.append(issue_key)
+        # record without id fails collecting of marks after it is loaded
+        return [{}] if issue_key == "A-0" else []
+
+    monkeypatch.setattr(ti, "get_tracker_issue_changelog_for_key", get_changelog)
+    issues = [{"key": f"A-{i}", "version": 1} for i in range(100)]
+
+    with pytest.raises(KeyError):
+        ti.get_tracker_issues_changelog(issues, workers=2, incremental=False, marks={})
+
+    assert len(loaded) < 10
@@ -1,13 +1,71 @@
-from typing import List
+import time
+#start of module load, see report_module_load
+MODULE_LOAD_STARTED = time.perf_counter()
+from typing import Any, List
 import requests
+from requests.adapters import HTTPAdapter
 import os
-import pandas as pd
+import importlib
+import json
+import csv
+import zlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
 import datetime
-from datetime import datetime, timedelta
-from isoduration import parse_duration
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from threading import Event, Lock, Thread
+from queue import Empty, Full, Queue
+from isoduration import WorkingCalendar, durations_to_minutes, minutes_to_durations
+
+class LazyModule:
+    """
+    Module imported on the first access to its attributes. Heavy modules needed only
+    for shaping & uploading of data do not delay the start of function invocation
+    """
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+        self.lock = Lock()
+
+    def load(self):
+        if self.module is None:
+            #concurrent first accesses wait for one import
+            with self.lock:
+                if self.module is None:
+                    started = time.perf_counter()
+                    self.module = importlib.import_module(self.name)
+                    print(datetime.now(), 'Module', self.name, 'imported in {:.0f} ms'.format((time.perf_counter() - started) * 1000))
+        return self.module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+MODULE_IMPORTS_FINISHED = time.perf_counter()
 
 TRACKER_API_URL_BASE_FOR_ISSUE_LIST = 'https://api.tracker.yandex.net/v2/issues/_search'
-TRACKER_API_URL_PARAMS_FOR_ISSUE_LIST = '?scrollType=unsorted&perScroll=100&scrollTTLMillis=60000'
+TRACKER_SCROLL_TTL_MILLIS = 60000
+TRACKER_API_URL_PARAMS_FOR_ISSUE_LIST = '?scrollType=unsorted&perScroll=100&scrollTTLMillis=' + str(TRACKER_SCROLL_TTL_MILLIS)
 TRACKER_API_URL_BASE_FOR_ISSUE_CHANGELOG = 'https://api.tracker.yandex.net/v2/issues/'
 TRACKER_API_URL_PARAMS_FOR_ISSUE_CHANGELOG = '/changelog?perPage=50&type=IssueWorkflow'
 
@@ -18,6 +76,130 @@ try:
     TRACKER_INITIAL_HISTORY_DEPTH = os.environ['TRACKER_INITIAL_HISTORY_DEPTH']
 except:
     TRACKER_INITIAL_HISTORY_DEPTH=''
+#Number of time slices of load window loaded with concurrent scrolls
+try:
+    TRACKER_BACKFILL_SHARDS = int(os.environ['TRACKER_BACKFILL_SHARDS'])
+except KeyError:
+    TRACKER_BACKFILL_SHARDS = 1
+#Max length (hours) of time slice of load window, 0 - window is split only into TRACKER_BACKFILL_SHARDS slices.
+#In 'streaming' & 'pipeline' modes finished slice is committed to checkpoint, so load resumed after
+#Tracker scroll has expired loads again only the slices which were not finished. Every slice is one more scroll,
+#'full' mode commits nothing before the end of the load and does not slice by time
+try:
+    TRACKER_LOAD_SLICE_HOURS = float(os.environ['TRACKER_LOAD_SLICE_HOURS'])
+except KeyError:
+    TRACKER_LOAD_SLICE_HOURS = 0.0
+#Load mode: 'full' - load all issues, then all changelogs, then upload everything at once
+#'streaming' - load, shape & upload issues scroll page by scroll page
+#'pipeline' - same batches as 'streaming', but fetch, shape & upload stages run in parallel threads
+try:
+    TRACKER_LOAD_MODE = os.environ['TRACKER_LOAD_MODE']
+except KeyError:
+    TRACKER_LOAD_MODE = 'full'
+#Max number of batches waiting in the queue between two pipeline stages
+try:
+    TRACKER_PIPELINE_QUEUE_SIZE = int(os.environ['TRACKER_PIPELINE_QUEUE_SIZE'])
+except KeyError:
+    TRACKER_PIPELINE_QUEUE_SIZE = 2
+#Incremental changelog: skip issues which version has not changed since the last load
+#and load only changelog records newer than the latest stored one
+try:
+    TRACKER_INCREMENTAL_CHANGELOG = os.environ['TRACKER_INCREMENTAL_CHANGELOG'].lower() in ('1', 'true', 'yes')
+except KeyError:
+    TRACKER_INCREMENTAL_CHANGELOG = False
+#Format of data inserted to ClickHouse: 'RowBinary' (typed binary rows) or 'TabSeparatedWithNames'
+try:
+    CH_INSERT_FORMAT = os.environ['CH_INSERT_FORMAT']
+except KeyError:
+    CH_INSERT_FORMAT = 'RowBinary'
+#Compression of data inserted to ClickHouse: 'gzip', 'zstd', 'lz4' or empty string for no compression
+try:
+    CH_INSERT_COMPRESSION = os.environ['CH_INSERT_COMPRESSION']
+except KeyError:
+    CH_INSERT_COMPRESSION = 'gzip'
+#Max number of rows and bytes of serialized data in one insert, bigger data is split into several inserts
+try:
+    CH_INSERT_MAX_ROWS = int(os.environ['CH_INSERT_MAX_ROWS'])
+except KeyError:
+    CH_INSERT_MAX_ROWS = 100000
+try:
+    CH_INSERT_MAX_BYTES = int(os.environ['CH_INSERT_MAX_BYTES'])
+except KeyError:
+    CH_INSERT_MAX_BYTES = 64 * 1024 * 1024
+CH_INSERT_TIMEOUT = 300
+#Size of pieces the insert request body is compressed & streamed by
+CH_INSERT_STREAM_CHUNK_SIZE = 1024 * 1024
+#Ids of changelog fields which values are objects, their 'display' is loaded to from_display & to_display
+try:
+    TRACKER_CHANGELOG_DISPLAY_FIELDS = frozenset(os.environ['TRACKER_CHANGELOG_DISPLAY_FIELDS'].split(','))
+except KeyError:
+    TRACKER_CHANGELOG_DISPLAY_FIELDS = frozenset(('status', 'resolution', 'assignee'))
+#Id of changelog field with issue status, its changes are loaded to CH_STATUS_TRANSITIONS_TABLE
+try:
+    TRACKER_STATUS_FIELD = os.environ['TRACKER_STATUS_FIELD']
+except KeyError:
+    TRACKER_STATUS_FIELD = 'status'
+#Display name of the status field in changelog table, its changes fill CH_STATUS_TRANSITIONS_TABLE once when it is created
+try:
+    TRACKER_STATUS_FIELD_DISPLAY = os.environ['TRACKER_STATUS_FIELD_DISPLAY']
+except KeyError:
+    TRACKER_STATUS_FIELD_DISPLAY = 'Статус'
+#Number of issue keys in one query for stored changelog state
+CH_STATE_QUERY_CHUNK_SIZE = 1000
+#Working calendar to convert estimation & spent time durations to minutes
+try:
+    TRACKER_WORK_HOURS_PER_DAY = float(os.environ['TRACKER_WORK_HOURS_PER_DAY'])
+except KeyError:
+    TRACKER_WORK_HOURS_PER_DAY = 8
+try:
+    TRACKER_WORK_DAYS_PER_WEEK = float(os.environ['TRACKER_WORK_DAYS_PER_WEEK'])
+except KeyError:
+    TRACKER_WORK_DAYS_PER_WEEK = 5
+try:
+    TRACKER_WORK_DAYS_PER_MONTH = float(os.environ['TRACKER_WORK_DAYS_PER_MONTH'])
+except KeyError:
+    TRACKER_WORK_DAYS_PER_MONTH = 20
+WORKING_CALENDAR = WorkingCalendar(
+    hours_per_day=TRACKER_WORK_HOURS_PER_DAY,
+    days_per_week=TRACKER_WORK_DAYS_PER_WEEK,
+    days_per_month=TRACKER_WORK_DAYS_PER_MONTH)
+#Number of issues which changelog is loaded in parallel
+try:
+    TRACKER_CHANGELOG_WORKERS = int(os.environ['TRACKER_CHANGELOG_WORKERS'])
+except KeyError:
+    TRACKER_CHANGELOG_WORKERS = 8
+#Decoder of Tracker API responses: 'msgspec', 'orjson', 'json' or 'auto' for the fastest installed one
+try:
+    TRACKER_JSON_DECODER = os.environ['TRACKER_JSON_DECODER']
+except KeyError:
+    TRACKER_JSON_DECODER = 'auto'
+if TRACKER_JSON_DECODER == 'auto':
+    TRACKER_JSON_DECODER = 'msgspec' if msgspec is not None else 'orjson' if orjson is not None else 'json'
+#Max rate of Tracker API calls (requests per second) shared by all workers
+try:
+    TRACKER_RATE_LIMIT = float(os.environ['TRACKER_RATE_LIMIT'])
+except KeyError:
+    TRACKER_RATE_LIMIT = 20.0
+#Number of retries of failed Tracker API call and base delay (seconds) of exponential backoff
+try:
+    TRACKER_MAX_RETRIES = int(os.environ['TRACKER_MAX_RETRIES'])
+except KeyError:
+    TRACKER_MAX_RETRIES = 5
+try:
+    TRACKER_RETRY_BACKOFF = float(os.environ['TRACKER_RETRY_BACKOFF'])
+except KeyError:
+    TRACKER_RETRY_BACKOFF = 1.0
+TRACKER_TIMEOUT = 60
+#Max pause (seconds) of Tracker API calls requested by Retry-After & X-RateLimit-Reset headers
+try:
+    TRACKER_MAX_PAUSE = float(os.environ['TRACKER_MAX_PAUSE'])
+except KeyError:
+    TRACKER_MAX_PAUSE = TRACKER_TIMEOUT
+#Number of kept-alive connections per host, should not be less than number of parallel changelog workers and scroll shards
+try:
+    HTTP_POOL_SIZE = int(os.environ['HTTP_POOL_SIZE'])
+except KeyError:
+    HTTP_POOL_SIZE = max(TRACKER_CHANGELOG_WORKERS + TRACKER_BACKFILL_SHARDS, 10)
 #ClickHouse params
 CH_PASSWORD = os.environ['CH_PASSWORD']
 CH_URL = 'https://{host}:8443/?database={db}'.format(
@@ -31,6 +213,40 @@ AUTH = {
 CERT = '/etc/ssl/certs/ca-certificates.crt'
 CH_ISSUES_TABLE = os.environ['CH_ISSUES_TABLE']
 CH_CHANGELOG_TABLE = os.environ['CH_CHANGELOG_TABLE']
+#Tables with the latest version of every record, maintained by materialized views
+CH_ISSUES_LATEST_TABLE = CH_ISSUES_TABLE + '_latest'
+#Table with issue status transitions and time spent in statuses
+try:
+    CH_STATUS_TRANSITIONS_TABLE = os.environ['CH_STATUS_TRANSITIONS_TABLE']
+except KeyError:
+    CH_STATUS_TRANSITIONS_TABLE = 'tracker_status_transitions'
+CH_CHANGELOG_LATEST_TABLE = CH_CHANGELOG_TABLE + '_latest'
+#Schema of issues & changelog tables: 'legacy' or 'tuned', existing tables are migrated when profile changes
+try:
+    CH_SCHEMA_PROFILE = os.environ['CH_SCHEMA_PROFILE']
+except KeyError:
+    CH_SCHEMA_PROFILE = 'legacy'
+#Table with loader state: checkpoints of interrupted loads
+try:
+    CH_STATE_TABLE = os.environ['CH_STATE_TABLE']
+except KeyError:
+    CH_STATE_TABLE = 'tracker_load_state'
+#Table with the latest loaded version & changelog record of every issue
+try:
+    CH_CHANGELOG_MARKS_TABLE = os.environ['CH_CHANGELOG_MARKS_TABLE']
+except KeyError:
+    CH_CHANGELOG_MARKS_TABLE = 'tracker_changelog_marks'
+#Where checkpoints of the load are stored: 'clickhouse' (CH_STATE_TABLE), 'file' (TRACKER_CHECKPOINT_FILE) or 'none'
+try:
+    TRACKER_CHECKPOINT_BACKEND = os.environ['TRACKER_CHECKPOINT_BACKEND']
+except KeyError:
+    TRACKER_CHECKPOINT_BACKEND = 'clickhouse'
+try:
+    TRACKER_CHECKPOINT_FILE = os.environ['TRACKER_CHECKPOINT_FILE']
+except KeyError:
+    TRACKER_CHECKPOINT_FILE = '/tmp/tracker-import-checkpoint.json'
+CHECKPOINT_NAME = 'issues_load:' + CH_ISSUES_TABLE
+WATERMARK_NAME = 'watermark:' + CH_ISSUES_TABLE
 
 #Columns to load into database
 issues_columns = ['organization_id',
@@ -87,7 +303,10 @@ issues_columns = ['organization_id',
             'resolvedAt',
             'resolvedBy_display',
             'resolution_display',
-            'lastQueue_display']
+            'lastQueue_display',
+            'originalEstimation_iso',
+            'spent_iso',
+            'estimation_iso']
 
 issue_changelog_columns = ['organization_id',
             'id',
@@ -100,81 +319,666 @@ issue_changelog_columns = ['organization_id',
             'to_display',
             'worklog']
 
-def get_issues_query_text():
+status_transitions_columns = ['issue_key',
+            'from_status',
+            'to_status',
+            'entered_at',
+            'left_at',
+            'minutes_in_status',
+            'minutes_from_created']
+
+#Columns made of lists of objects: column -> (list field, key of object joined into comma separated string)
+issues_list_columns = {
+    'boards_names': ('boards', 'name'),
+    'components_display': ('components', 'display'),
+    'sprint_display': ('sprint', 'display'),
+}
+
+#List of columns with dateTime data format, DateTime64(3) in database
+issues_date_time_columns: List[str] = [
+    'statusStartTime',
+    'createdAt',
+    'updatedAt',
+    'lastCommentUpdatedAt',
+    'start',
+    'end',
+    'resolvedAt'
+]
+issue_changelog_date_time_columns: List[str] = [
+    'updatedAt'
+]
+status_transitions_date_time_columns: List[str] = [
+    'entered_at',
+    'left_at'
+]
+#Columns with estimation & spent time durations, converted to working minutes while shaping
+issues_duration_columns: List[str] = [
+    'originalEstimation',
+    'spent',
+    'estimation'
+]
+#Normalized ISO 8601 durations made of working minutes, they convert back to the same minutes
+issues_iso_duration_columns: List[str] = [col + '_iso' for col in issues_duration_columns]
+#List of columns with decimal data format, converted to numbers while shaping
+issues_numeric_columns: List[str] = [
+    'storyPoints',
+    'commentWithExternalMessageCount',
+    'commentWithoutExternalMessageCount',
+    'votes',
+    'checklistDone',
+    'checklistTotal'
+]
+#List of columns with Decimal(15,2) data format in database
+issues_decimal_columns: List[str] = issues_numeric_columns + issues_duration_columns
+status_transitions_decimal_columns: List[str] = [
+    'minutes_in_status',
+    'minutes_from_created'
+]
+#Columns with few distinct values, stored as LowCardinality dictionaries in 'tuned' schema
+issues_low_cardinality_columns: List[str] = [
+    'organization_id',
+    'type_display',
+    'priority_display',
+    'queue_key',
+    'queue_display',
+    'status_display',
+    'previousStatus_display',
+    'project_display',
+    'resolution_display',
+    'previousQueue_display',
+    'lastQueue_display',
+    'favorite'
+] + issues_iso_duration_columns
+issue_changelog_low_cardinality_columns: List[str] = [
+    'organization_id',
+    'type',
+    'field_display',
+    'from_display',
+    'to_display'
+]
+#Columns with long text, compressed with ZSTD in 'tuned' schema
+issues_text_columns: List[str] = [
+    'self',
+    'summary',
+    'followers',
+    'tags',
+    'sla'
+]
+#Schemas of tables, see get_create_table_query
+ISSUES_TABLE_SCHEMA = {
+    'columns': issues_columns,
+    'date_time_columns': issues_date_time_columns,
+    'decimal_columns': issues_decimal_columns,
+    'order_by': '(id)',
+    #creation time of issue does not change, so all versions of issue are in one partition
+    'partition_by': 'createdAt',
+    'low_cardinality_columns': issues_low_cardinality_columns,
+    'text_columns': issues_text_columns,
+    'index_columns': ['key'],
+    #columns added after the table was first released, added to existing tables on init
+    'added_columns': issues_iso_duration_columns,
+}
+ISSUE_CHANGELOG_TABLE_SCHEMA = {
+    'columns': issue_changelog_columns,
+    'date_time_columns': issue_changelog_date_time_columns,
+    'decimal_columns': [],
+    'order_by': '(id, field_display)',
+    'partition_by': 'updatedAt',
+    'low_cardinality_columns': issue_changelog_low_cardinality_columns,
+    'text_columns': [],
+    'index_columns': ['issue_key'],
+    'added_columns': [],
+}
+#Format of timestamps in Tracker API responses, e.g. 2023-03-01T10:22:33.123+0000
+TRACKER_DATE_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+#Timezone of DateTime64 columns in database
+CH_DATE_TIME_TIMEZONE = 'Europe/Moscow'
+
+HTTP_SESSION = None
+HTTP_SESSION_LOCK = Lock()
+
+def get_http_session():
     """
-    Get latest lecord which has been loaded to tracker_isuues table:    
+    Get HTTP session shared by all Tracker API and ClickHouse calls.
+    Session keeps a pool of connections per host alive between calls (and between
+    invocations of warm cloud function), so TCP & TLS handshake is made once per
+    pooled connection instead of once per request
+    
     Arguments:
-        query_url_base (str): Yandex Tracker API URL base
+        Nothing
+    Returns:
+        requests.Session object
+    """
+    global HTTP_SESSION
+    with HTTP_SESSION_LOCK:
+        if HTTP_SESSION is None:
+            session = requests.Session()
+            #one pool for Tracker API host and one for ClickHouse host
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            HTTP_SESSION = session
+    return HTTP_SESSION
+
+class TokenBucket:
+    """
+    Client side rate limiter shared by all threads calling Tracker API.
+    Rate is adaptive: it is halved every time Tracker answers 429 Too Many Requests
+    and grows back to the max rate step by step on successful calls
+    """
+    def __init__(self, max_rate):
+        self.max_rate = max_rate
+        self.min_rate = max_rate / 32
+        self.rate = max_rate
+        self.capacity = max(max_rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = Lock()
+
+    def acquire(self):
+        """
+        Wait until call is allowed and take one token
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.blocked_until:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.blocked_until - now
+            time.sleep(wait)
+
+    def throttle(self, pause):
+        """
+        Tracker rate limit is hit: halve the rate and block all callers for pause seconds.
+        Parallel calls rejected during the same pause halve the rate only once
+        """
+        with self.lock:
+            if time.monotonic() >= self.blocked_until:
+                self.rate = max(self.rate / 2, self.min_rate)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            self.updated = self.blocked_until
+            self.tokens = 0.0
+
+    def pause(self, pause):
+        """
+        Block all callers for pause seconds without changing the rate
+        """
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            self.updated = max(self.updated, self.blocked_until)
+
+    def relax(self):
+        """
+        Successful call: increase the rate by 1/16 of max rate up to max rate
+        """
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 16)
+
+TRACKER_RATE_LIMITER = TokenBucket(TRACKER_RATE_LIMIT)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+def get_retry_after(response, max_pause=TRACKER_MAX_PAUSE):
+    """
+    Get delay in seconds from Retry-After header (number of seconds or HTTP date)
+    
+    Arguments:
+        response (requests.Response): Tracker API response
+        max_pause (float): max delay in seconds
+    Returns:
+        delay in seconds, None if header is missing or malformed
+    """
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is None:
+        return None
+    try:
+        return min(max(float(retry_after), 0.0), max_pause)
+    except ValueError:
+        pass
+    try:
+        return min(max((parsedate_to_datetime(retry_after) - datetime.now(tz=timezone.utc)).total_seconds(), 0.0), max_pause)
+    except (TypeError, ValueError):
+        return None
+
+#X-RateLimit-Reset values bigger than this are epoch timestamps (2001-09-09), not seconds
+RATE_LIMIT_RESET_EPOCH_THRESHOLD = 10 ** 9
+
+def get_rate_limit_reset(response, max_pause=TRACKER_MAX_PAUSE):
+    """
+    Get delay in seconds until rate limit window is reset from X-RateLimit-Reset header.
+    Header is either number of seconds or epoch timestamp of the reset: values bigger
+    than RATE_LIMIT_RESET_EPOCH_THRESHOLD are timestamps, ones already passed
+    (e.g. with clock skew) give no delay
+    
+    Arguments:
+        response (requests.Response): Tracker API response
+        max_pause (float): max delay in seconds
+    Returns:
+        delay in seconds, None if header is missing or malformed
+    """
+    try:
+        reset = float(response.headers['X-RateLimit-Reset'])
+    except (KeyError, ValueError):
+        return None
+    if reset > RATE_LIMIT_RESET_EPOCH_THRESHOLD:
+        reset -= time.time()
+    return min(max(reset, 0.0), max_pause)
+
+MSGSPEC_DECODERS = {}
+MSGSPEC_DECODERS_LOCK = Lock()
+
+def get_msgspec_decoder(fields):
+    """
+    Get msgspec decoder of list of objects with given top level fields, other fields are skipped
+    while decoding. Decoders are built once per set of fields
+    """
+    with MSGSPEC_DECODERS_LOCK:
+        decoder = MSGSPEC_DECODERS.get(fields)
+        if decoder is None:
+            record_type = msgspec.defstruct('TrackerRecord', [(field, Any, None) for field in sorted(fields)])
+            decoder = msgspec.json.Decoder(List[record_type])
+            MSGSPEC_DECODERS[fields] = decoder
+    return decoder
+
+def decode_tracker_json(content, fields=None, decoder=TRACKER_JSON_DECODER):
+    """
+    Decode Tracker API response with list of records. If fields are given, only these top level fields
+    of records are kept: msgspec skips other fields while decoding, orjson & json drop them after decoding
+    
+    Arguments:
+        content (bytes): response body
+        fields (frozenset): top level fields of records to keep, None to keep all fields
+        decoder (str): 'msgspec', 'orjson' or 'json'
+    Returns:
+        list of records
+    """
+    if decoder == 'msgspec':
+        try:
+            if fields is None:
+                data = msgspec.json.decode(content)
+            else:
+                #missing fields are decoded as None, which is the same as missing for shaping
+                return [msgspec.structs.asdict(record) for record in get_msgspec_decoder(fields).decode(content)]
+        except msgspec.DecodeError as err:
+            raise ValueError('Unexpected Tracker API response: ' + str(err))
+    elif decoder == 'orjson':
+        data = orjson.loads(content)
+    else:
+        data = json.loads(content)
+    if not isinstance(data, list):
+        raise ValueError('Unexpected Tracker API response: ' + content.decode('utf-8', errors='replace'))
+    if fields is not None:
+        data = [{field: record[field] for field in fields if field in record} for record in data]
+    return data
+
+def call_tracker_api(method, query_url, headers=TRACKER_HEADERS, query_body=None, fields=None):
+    """
+    Make Tracker API call limited by shared rate limiter. Calls failed with 429, 5xx or
+    connection error are retried with jittered exponential backoff or after Retry-After delay.
+    The same URL is requested again, so scroll & pagination resume from the last scroll token or next link
+    
+    Arguments:
+        method (str): HTTP method
+        query_url (str): Yandex Tracker API URL
         headers (str): Yandex Tracker API Haders
-        query_text (str): Yandex Tracker query for search issues
+        query_body (json): request body
+        fields (frozenset): top level fields of records to keep, None to keep all fields
     Returns:
-        json object with records
+        tuple of response and its json list of records
+    """
+    for attempt in range(TRACKER_MAX_RETRIES + 1):
+        TRACKER_RATE_LIMITER.acquire()
+        delay = random.uniform(0, TRACKER_RETRY_BACKOFF * 2 ** attempt)
+        try:
+            response = get_http_session().request(method, query_url, headers=headers, json=query_body, timeout=TRACKER_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout) as err:
+            error = str(err)
+        else:
+            if response.status_code == 200:
+                data = decode_tracker_json(response.content, fields)
+                TRACKER_RATE_LIMITER.relax()
+                #no more calls allowed in the current rate limit window
+                if response.headers.get('X-RateLimit-Remaining') == '0':
+                    reset = get_rate_limit_reset(response)
+                    if reset is not None:
+                        TRACKER_RATE_LIMITER.pause(reset)
+                return response, data
+            if response.status_code not in RETRY_STATUS_CODES:
+                raise ValueError(response.text)
+            error = str(response.status_code) + ' ' + response.text
+            retry_after = get_retry_after(response)
+            if retry_after is not None:
+                delay = retry_after
+            if response.status_code == 429:
+                TRACKER_RATE_LIMITER.throttle(delay)
+        if attempt < TRACKER_MAX_RETRIES:
+            print('Tracker API call failed: ' + error + ', retry in {delay:.1f}s'.format(delay=delay))
+            time.sleep(delay)
+    raise ValueError('Tracker API call failed after ' + str(TRACKER_MAX_RETRIES) + ' retries: ' + error)
+
+def get_issues_query_texts(shards=TRACKER_BACKFILL_SHARDS, slice_hours=TRACKER_LOAD_SLICE_HOURS):
+    """
+    Get Tracker queries for issues updated after the latest record loaded to tracker_isuues table,
+    or during TRACKER_INITIAL_HISTORY_DEPTH for initial load. Load window is split into time slices
+    not longer than slice_hours and into at least shards slices, see get_sliced_query_texts
+    
+    Arguments:
+        shards (int): min number of time slices, loaded concurrently
+        slice_hours (float): max length of time slice
+    Returns:
+        list of Yandex Tracker queries for search issues
     """
-    # Get latest updated issue form database
-    get_max_uploaded_at_query='select MAX(updatedAt) from tracker_issues'
-    response=run_clickhouse_query(get_max_uploaded_at_query)
-    latest_record_time = datetime.strptime(response[:-5], "%Y-%m-%d %H:%M:%S")
+    latest_record_time = get_latest_record_time()
 
-    if latest_record_time > datetime.strptime('1970-01-01 03:00:00', "%Y-%m-%d %H:%M:%S"):
+    if latest_record_time is not None:
         # subtract 5 minutes to handle possible time overlapping & late updates
-        start_time = str(latest_record_time - timedelta(minutes=5))
-        tracker_query_text = 'updated: > "' + start_time + '"'
-        return tracker_query_text
+        start_time = latest_record_time.replace(microsecond=0) - timedelta(minutes=5)
+        tracker_query_text = 'updated: > "' + str(start_time) + '"'
+        return get_sliced_query_texts(tracker_query_text, start_time, datetime.now(), shards, slice_hours)
     elif TRACKER_INITIAL_HISTORY_DEPTH != '':
-        tracker_query_text = 'updated: >now()-' + TRACKER_INITIAL_HISTORY_DEPTH
-        return tracker_query_text
+        return get_backfill_query_texts(TRACKER_INITIAL_HISTORY_DEPTH, shards, slice_hours=slice_hours)
     else:
-        return 'updated: >now() - 1y'
+        return get_backfill_query_texts('1y', shards, slice_hours=slice_hours)
 
+def get_latest_record_time():
+    """
+    Get update time of the latest issue loaded to CH_ISSUES_TABLE. It is taken from the watermark
+    saved by the previous load with a point lookup in checkpoint store, the issues table
+    is scanned only if no watermark has been saved yet
+    
+    Returns:
+        datetime, None if no issues are loaded
+    """
+    watermark = read_checkpoint(WATERMARK_NAME)
+    if watermark is None:
+        get_max_updated_at_query = 'SELECT max(updatedAt) FROM ' + CH_ISSUES_TABLE + ' HAVING count() > 0 FORMAT TabSeparated'
+        watermark = run_clickhouse_query(get_max_updated_at_query).strip()
+    return parse_watermark(watermark)
 
-def get_tracker_issue_list(query_url_base=TRACKER_API_URL_BASE_FOR_ISSUE_LIST, headers=TRACKER_HEADERS, query_text='updated: >now()-1y'):
+def parse_watermark(watermark):
     """
-    Load issue list from Yandex Tracker using scroll method, see doc:
+    Parse 'YYYY-MM-DD hh:mm:ss[.fff]' time of the latest loaded issue
+    
+    Arguments:
+        watermark (str): time string, empty if no issues are loaded
+    Returns:
+        datetime, None for empty string and zero time of missing values
+    """
+    if watermark == '':
+        return None
+    try:
+        latest_record_time = datetime.fromisoformat(watermark)
+    except ValueError:
+        raise ValueError('Unexpected time of the latest loaded issue: ' + repr(watermark))
+    if latest_record_time.year <= 1970:
+        return None
+    return latest_record_time
+
+def parse_history_depth(depth):
+    """
+    Parse Tracker relative time like '3y', '730d', '12w' or '48h'
+    
+    Arguments:
+        depth (str): relative time
+    Returns:
+        timedelta, None if depth could not be parsed
+    """
+    unit_hours = {'y': 365 * 24, 'w': 7 * 24, 'd': 24, 'h': 1}
+    try:
+        return timedelta(hours=float(depth.strip()[:-1]) * unit_hours[depth.strip()[-1]])
+    except (KeyError, ValueError, IndexError):
+        return None
+
+def get_backfill_query_texts(depth, shards, now=None, slice_hours=TRACKER_LOAD_SLICE_HOURS):
+    """
+    Split initial load window 'updated: >now()-depth' into time slices, see get_sliced_query_texts
+    
+    Arguments:
+        depth (str): Tracker relative time of initial load window
+        shards (int): min number of slices
+        now (datetime): end of the window, current time by default
+        slice_hours (float): max length of slice
+    Returns:
+        list of Yandex Tracker queries for search issues, one per slice
+    """
+    window = parse_history_depth(depth)
+    if window is None:
+        return ['updated: >now()-' + depth]
+
+    now = now or datetime.now()
+    return get_sliced_query_texts('updated: >now()-' + depth, now - window, now, shards, slice_hours)
+
+def get_sliced_query_texts(first_query_text, start_time, end_time, shards, slice_hours=TRACKER_LOAD_SLICE_HOURS):
+    """
+    Split load window into time slices of equal length: at least shards slices, each not longer
+    than slice_hours. Neighbouring slices share the same boundary literal, so no issue falls between them,
+    the last slice has no upper bound
+    
+    Arguments:
+        first_query_text (str): Tracker query with lower bound of the window
+        start_time (datetime): start of the window
+        end_time (datetime): end of the window
+        shards (int): min number of slices
+        slice_hours (float): max length of slice, 0 for no limit
+    Returns:
+        list of Yandex Tracker queries for search issues, one per slice
+    """
+    window = end_time - start_time
+    slices = max(shards, 1)
+    if slice_hours > 0:
+        slices = max(slices, math.ceil(window / timedelta(hours=slice_hours)))
+    if slices <= 1:
+        return [first_query_text]
+
+    bounds = [(start_time + window * i / slices).strftime('%Y-%m-%d %H:%M:%S') for i in range(1, slices)]
+    query_texts = [first_query_text + ' AND updated: < "' + bounds[0] + '"']
+    for lower, upper in zip(bounds, bounds[1:]):
+        query_texts.append('updated: >= "' + lower + '" AND updated: < "' + upper + '"')
+    query_texts.append('updated: >= "' + bounds[-1] + '"')
+    return query_texts
+
+
+def iter_tracker_issue_pages(query_url_base=TRACKER_API_URL_BASE_FOR_ISSUE_LIST, headers=TRACKER_HEADERS, query_text='updated: >now()-1y', scroll=None):
+    """
+    Load issue list from Yandex Tracker using scroll method page by page, see doc:
     https://cloud.yandex.ru/docs/tracker/concepts/issues/search-issues#scroll
     
     Arguments:
         query_url_base (str): Yandex Tracker API URL base
         headers (str): Yandex Tracker API Haders
         query_text (str): Yandex Tracker query for search issues
+        scroll (dict): scroll position, updated before every yielded page.
+            Scroll is continued from the position if it has scroll id
     Returns:
-        json object with records
+        generator of json objects with records, one object per scroll page
     """
-    query_url = query_url_base+TRACKER_API_URL_PARAMS_FOR_ISSUE_LIST
     #Query to filter Tracker issues
     query_body={'query': query_text}
-    #Make Tracker API call
-    response = requests.post(query_url, headers=headers, json=query_body) #response = requests.post(query_url, headers=headers, json=query_body)
-    issues_data = response.json()
+    if scroll is None:
+        scroll = {}
+    first_page = not scroll.get('scroll_id')
+    if first_page:
+        query_url = query_url_base+TRACKER_API_URL_PARAMS_FOR_ISSUE_LIST
+        scroll['issues_loaded'] = 0
+    else:
+        query_url = query_url_base+'?scrollId='+scroll['scroll_id']+'&scrollToken='+scroll['scroll_token']
     
     #loop wile number of collected data less than tootal records in query result
-    while len(issues_data) < int(response.headers['X-Total-Count']):
-        scrollId=response.headers['X-Scroll-Id']
-        scrollToken=response.headers['X-Scroll-Token']
-        query_url=query_url_base+'?scrollId='+scrollId+'&scrollToken='+scrollToken
-        response = requests.post(query_url, headers=headers, json=query_body)
-        issues_data.extend(response.json())
+    while True:
+        #Make Tracker API call
+        response, issues_page = call_tracker_api('POST', query_url, headers=headers, query_body=query_body, fields=TRACKER_ISSUE_FIELDS)
+        #empty page means that scroll is over, even if total count has changed during the scroll
+        if len(issues_page) == 0 and not first_page:
+            scroll['done'] = True
+            #empty page is yielded, so the finished scroll is committed as done
+            yield issues_page
+            break
+        scroll['issues_loaded'] += len(issues_page)
+        scroll['total'] = int(response.headers['X-Total-Count'])
+        scroll['scroll_id'] = response.headers.get('X-Scroll-Id', '')
+        scroll['scroll_token'] = response.headers.get('X-Scroll-Token', '')
+        scroll['fetched_at'] = time.time()
+        scroll['done'] = scroll['issues_loaded'] >= scroll['total']
+        yield issues_page
+        if scroll['done']:
+            break
+        first_page = False
+        query_url=query_url_base+'?scrollId='+scroll['scroll_id']+'&scrollToken='+scroll['scroll_token']
+
+def get_tracker_issue_list(query_url_base=TRACKER_API_URL_BASE_FOR_ISSUE_LIST, headers=TRACKER_HEADERS, query_text='updated: >now()-1y'):
+    """
+    Load issue list from Yandex Tracker using scroll method, see doc:
+    https://cloud.yandex.ru/docs/tracker/concepts/issues/search-issues#scroll
+    
+    Arguments:
+        query_url_base (str): Yandex Tracker API URL base
+        headers (str): Yandex Tracker API Haders
+        query_text (str): Yandex Tracker query for search issues
+    Returns:
+        json object with records
+    """
+    issues_data = []
+    for issues_page in iter_tracker_issue_pages(query_url_base, headers=headers, query_text=query_text):
+        issues_data.extend(issues_page)
     
     print('Tracker data loaded, total records: ', len(issues_data))
     return issues_data
 
-def get_tracker_issue_changelog_for_key(issue_key='', headers=TRACKER_HEADERS):
+def iter_sharded_issue_pages(query_texts, scrolls, shards=TRACKER_BACKFILL_SHARDS):
+    """
+    Run scrolls of queries concurrently, at most shards at once, and yield pages in the order they are loaded.
+    Issue updated during the load could move from one time slice to another, so issue
+    already yielded by other shard is dropped unless it is a newer version of the issue
+    
+    Arguments:
+        query_texts (list): Yandex Tracker queries for search issues, one per shard
+        scrolls (dict): query -> scroll position to continue, see iter_tracker_issue_pages
+        shards (int): max number of concurrent scrolls
+    Returns:
+        generator of tuples (query, scroll position after the page, json object with page records)
+    """
+    shards = max(1, min(shards, len(query_texts)))
+    pages_queue = Queue(maxsize=shards)
+    stop_event = Event()
+    errors = []
+    pending_query_texts = iter(query_texts)
+    pending_query_texts_lock = Lock()
+
+    def scroll_shard():
+        try:
+            while True:
+                with pending_query_texts_lock:
+                    query_text = next(pending_query_texts, None)
+                if query_text is None:
+                    break
+                scroll = dict(scrolls.get(query_text, {}))
+                for issues_page in iter_tracker_issue_pages(TRACKER_API_URL_BASE_FOR_ISSUE_LIST, query_text=query_text, scroll=scroll):
+                    put_to_pipeline_queue(pages_queue, (query_text, dict(scroll), issues_page), stop_event)
+            put_to_pipeline_queue(pages_queue, None, stop_event)
+        except PipelineStopped:
+            pass
+        except Exception as err:
+            errors.append(err)
+            stop_event.set()
+
+    workers = [Thread(target=scroll_shard) for _ in range(shards)]
+    for worker in workers:
+        worker.start()
+
+    loaded_versions = {}
+    finished_shards = 0
+    try:
+        while finished_shards < shards:
+            shard_page = get_from_pipeline_queue(pages_queue, stop_event)
+            if shard_page is None:
+                finished_shards += 1
+                continue
+            query_text, scroll, issues_page = shard_page
+            #page of duplicates is still yielded to commit the scroll position
+            yield query_text, scroll, drop_loaded_issues(issues_page, loaded_versions)
+    except PipelineStopped:
+        pass
+    finally:
+        #stop shards still running if consumer has stopped iteration
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+    if errors:
+        raise errors[0]
+
+def drop_loaded_issues(issues_page, loaded_versions):
+    """
+    Drop issues already loaded from other time slice unless the record is a newer version of the issue
+    
+    Arguments:
+        issues_page (list): page of issue records
+        loaded_versions (dict): issue id -> version of loaded record, updated with the page records
+    Returns:
+        list of issue records
+    """
+    issues_page = [i for i in issues_page
+        if i['id'] not in loaded_versions or get_issue_version(i) > loaded_versions[i['id']]]
+    loaded_versions.update((i['id'], get_issue_version(i)) for i in issues_page)
+    return issues_page
+
+def get_issue_version(issue):
+    """
+    Get comparable version of issue record: version number, then update time
+    (Tracker timestamps of the same format are compared the same way as times)
+    """
+    version = issue.get('version')
+    return (version if isinstance(version, int) else -1, issue.get('updatedAt') or '')
+
+def iter_issue_pages(query_texts, scrolls=None, shards=TRACKER_BACKFILL_SHARDS):
+    """
+    Load issue list page by page, with one scroll per query, see iter_tracker_issue_pages.
+    Issue updated during the load could move from one query time slice to another, see drop_loaded_issues
+    
+    Arguments:
+        query_texts (list): Yandex Tracker queries for search issues
+        scrolls (dict): query -> scroll position to continue, positions are copied and not changed
+        shards (int): max number of concurrent scrolls
+    Returns:
+        generator of tuples (query, scroll position after the page, json object with page records)
+    """
+    if scrolls is None:
+        scrolls = {}
+    if len(query_texts) > 1 and shards > 1:
+        print(datetime.now(), 'Loading', len(query_texts), 'time slices of issues with', min(shards, len(query_texts)), 'concurrent scrolls')
+        yield from iter_sharded_issue_pages(query_texts, scrolls, shards)
+        return
+    loaded_versions = {}
+    for query_text in query_texts:
+        scroll = dict(scrolls.get(query_text, {}))
+        for issues_page in iter_tracker_issue_pages(TRACKER_API_URL_BASE_FOR_ISSUE_LIST, query_text=query_text, scroll=scroll):
+            yield query_text, dict(scroll), drop_loaded_issues(issues_page, loaded_versions)
+
+def get_tracker_issue_changelog_for_key(issue_key='', headers=TRACKER_HEADERS, since_id=''):
     """
     Load issue changelog from Yandex Tracker using scroll method, see doc:
     https://cloud.yandex.ru/docs/tracker/concepts/issues/search-issues#scroll
     
     Arguments:
-        query_url_base (str): Yandex Tracker API URL base
+        issue_key (str): Yandex Tracker issue key
         headers (str): Yandex Tracker API Haders
-        query_text (str): Yandex Tracker query for search issues
+        since_id (str): id of changelog record to start after, empty string to load the whole changelog
     Returns:
         json object with records
     """
     query_url = TRACKER_API_URL_BASE_FOR_ISSUE_CHANGELOG+issue_key+TRACKER_API_URL_PARAMS_FOR_ISSUE_CHANGELOG
+    if since_id != '':
+        query_url += '&id=' + since_id
     #Query to filter Tracker issues
     #query_body={'query': query_text}
     #Make Tracker API call
-    response = requests.get(query_url, headers=headers)
-    changelog_data = response.json()
+    response, changelog_data = call_tracker_api('GET', query_url, headers=headers, fields=TRACKER_CHANGELOG_FIELDS)
     try: 
         query_url=response.links['next']['url']
     except KeyError:
@@ -182,217 +986,429 @@ def get_tracker_issue_changelog_for_key(issue_key='', headers=TRACKER_HEADERS):
 
     #loop wile number of collected data less than tootal records in query result
     while query_url != '':
-        response = requests.get(query_url, headers=headers)
+        response, changelog_page = call_tracker_api('GET', query_url, headers=headers, fields=TRACKER_CHANGELOG_FIELDS)
         try: 
             query_url=response.links['next']['url']
         except KeyError:
             query_url=''
-        changelog_data.extend(response.json())
+        changelog_data.extend(changelog_page)
     
     print('Issue '+ issue_key + ' history data loaded, total records: ', len(changelog_data))
     return changelog_data
 
-def get_tracker_issues_changelog(issues_json_data):
+def quote_clickhouse_string(value):
+    """
+    Quote string to be used as a literal in ClickHouse query
+    """
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def get_stored_changelog_state(issue_keys):
+    """
+    Get state of issues stored in database by the previous loads: version of the latest issue record
+    and id of the latest changelog record. Keys are queried in bulk, one query per chunk of keys.
+    State is taken from CH_CHANGELOG_MARKS_TABLE, issues loaded before the marks table
+    was introduced are looked up in issues & changelog tables
+    
+    Arguments:
+        issue_keys (list): Yandex Tracker issue keys
+    Returns:
+        dict: issue key -> tuple (version, latest changelog id), only for issues stored in database
+    """
+    state = {}
+    for i in range(0, len(issue_keys), CH_STATE_QUERY_CHUNK_SIZE):
+        keys_list = ', '.join(quote_clickhouse_string(key) for key in issue_keys[i:i+CH_STATE_QUERY_CHUNK_SIZE])
+        marks_query = '''
+            SELECT issue_key, argMax(version, updatedAt), argMax(changelog_id, updatedAt)
+            FROM ''' + CH_CHANGELOG_MARKS_TABLE + ''' WHERE issue_key IN (''' + keys_list + ''')
+            GROUP BY issue_key
+            FORMAT TabSeparated
+        '''
+        response = run_clickhouse_query(marks_query)
+        for line in response.splitlines():
+            key, version, changelog_id = line.split('\t')
+            state[key] = (version, changelog_id)
+
+        unmarked_keys = [key for key in issue_keys[i:i+CH_STATE_QUERY_CHUNK_SIZE] if key not in state]
+        if len(unmarked_keys) == 0:
+            continue
+        keys_list = ', '.join(quote_clickhouse_string(key) for key in unmarked_keys)
+        state_query = '''
+            SELECT i.key, i.version, c.id
+            FROM (
+                SELECT key, argMax(version, updatedAt) AS version
+                FROM ''' + CH_ISSUES_TABLE + ''' WHERE key IN (''' + keys_list + ''')
+                GROUP BY key
+            ) i
+            LEFT JOIN (
+                SELECT issue_key, argMax(id, updatedAt) AS id
+                FROM ''' + CH_CHANGELOG_TABLE + ''' WHERE issue_key IN (''' + keys_list + ''')
+                GROUP BY issue_key
+            ) c ON i.key = c.issue_key
+            FORMAT TabSeparated
+        '''
+        response = run_clickhouse_query(state_query)
+        for line in response.splitlines():
+            key, version, changelog_id = line.split('\t')
+            state[key] = (version, changelog_id)
+    return state
+
+def get_tracker_issues_changelog(issues_json_data, workers=TRACKER_CHANGELOG_WORKERS, incremental=TRACKER_INCREMENTAL_CHANGELOG, marks=None):
     """
-    Collect changelog for isssues represented in json
+    Collect changelog for isssues represented in json.
+    Changelogs of different issues are loaded in parallel by a pool of threads,
+    pages of a single issue are loaded one by one, so records keep the same order
+    as with the serial load: issue by issue, page by page.
+    In incremental mode issues which version is the same as stored in database are skipped
+    and for others only changelog records after the latest stored one are loaded
     
     Arguments:
         issues_json_data (json): input JSON data
+        workers (int): number of issues which changelog is loaded in parallel
+        incremental (bool): load only changelog records missing in database
+        marks (dict): if passed, filled with issue key -> tuple (version, latest changelog id)
+            for every issue which changelog is loaded, see upload_changelog_marks
     Returns:
-        Pandas json object with records
+        json object with records
     """
+    issue_keys = [i['key'] for i in issues_json_data]
+    since_ids = [''] * len(issue_keys)
+    if incremental:
+        stored_state = get_stored_changelog_state(issue_keys)
+        changed_keys = []
+        since_ids = []
+        for i in issues_json_data:
+            stored_version, stored_changelog_id = stored_state.get(i['key'], ('', ''))
+            if stored_version == str(i['version']):
+                continue
+            changed_keys.append(i['key'])
+            since_ids.append(stored_changelog_id)
+        print('Changelog of', len(issue_keys) - len(changed_keys), 'unchanged issues skipped')
+        issue_keys = changed_keys
+
+    load_changelog = lambda issue_key, since_id: get_tracker_issue_changelog_for_key(issue_key=issue_key, since_id=since_id)
+    if workers <= 1:
+        issue_changelogs = map(load_changelog, issue_keys, since_ids)
+    else:
+        #executor.map returns results in the order of issue keys, not in the order of completion
+        executor = ThreadPoolExecutor(max_workers=workers)
+        issue_changelogs = executor.map(load_changelog, issue_keys, since_ids)
+
     changelog_json = []
-    for i in issues_json_data:
-        changelog_json.extend(get_tracker_issue_changelog_for_key(issue_key=i['key']))
+    versions = {i['key']: str(i['version']) for i in issues_json_data} if marks is not None else {}
+    try:
+        for issue_key, since_id, issue_changelog in zip(issue_keys, since_ids, issue_changelogs):
+            changelog_json.extend(issue_changelog)
+            if marks is not None:
+                marks[issue_key] = (versions[issue_key], issue_changelog[-1]['id'] if issue_changelog else since_id)
+    finally:
+        #on failure of one issue changelogs of the others still queued are not loaded
+        if workers > 1:
+            executor.shutdown(cancel_futures=True)
 
     return changelog_json
 
+def normalize_date_time_column(column):
+    """
+    Convert column of Tracker timestamps to UTC time strings in 'YYYY-MM-DD hh:mm:ss.fff' format.
+    Tracker format is parsed explicitly, only values in other formats (e.g. dates of 'start' & 'end')
+    fall back to format guessing. Missing values become '1970-01-01 00:00:00.000'.
+    Strings are formatted in bulk as fixed width numpy array, without Python call per value
+    
+    Arguments:
+        column (Series): column with Tracker timestamps
+    Returns:
+        Series with formatted strings
+    """
+    date_times = pd.to_datetime(column, format=TRACKER_DATE_TIME_FORMAT, errors='coerce', utc=True)
+    unparsed = date_times.isna() & column.notna() & (column != '')
+    if unparsed.any():
+        date_times[unparsed] = pd.to_datetime(column[unparsed], utc=True)
+
+    values = date_times.dt.tz_localize(None).to_numpy(dtype='datetime64[ms]')
+    values[np.isnat(values)] = np.datetime64(0, 'ms')
+    #'YYYY-MM-DDThh:mm:ss.fff' strings, 23 characters each: replace 'T' with space in place
+    text = np.datetime_as_string(values, unit='ms').astype('U23')
+    chars = text.view('U1').reshape(len(text), 23)
+    chars[:, 10] = ' '
+    return pd.Series(text, index=column.index, dtype=object)
+
+def compile_json_columns(columns, list_columns={}, constant_columns=()):
+    """
+    Compile list of flattened column names (as made by pd.json_normalize with sep='_')
+    into key paths of nested JSON objects, e.g. 'queue_key' -> ('queue', 'key')
+    
+    Arguments:
+        columns (list): column names
+        list_columns (dict): columns made of list of objects: column -> (list field, key of object)
+        constant_columns (list): columns filled in after extraction, skipped here
+    Returns:
+        list of tuples (column, key path, key of object in list or None)
+    """
+    compiled = []
+    for col in columns:
+        if col in constant_columns:
+            continue
+        if col in list_columns:
+            list_field, item_key = list_columns[col]
+            compiled.append((col, (list_field,), item_key))
+        else:
+            compiled.append((col, tuple(col.split('_')), None))
+    return compiled
+
+def get_json_value(item, path):
+    """
+    Get value of JSON object by key path, None if value is missing or is an object itself
+    """
+    value = item
+    for key in path:
+        if type(value) is not dict:
+            return None
+        value = value.get(key)
+    if type(value) is dict:
+        return None
+    return value
+
+def extract_json_columns(json_data, compiled_columns):
+    """
+    Fill columns with values of JSON objects in one pass over the objects.
+    Values are looked up by precompiled key paths, missing values and nested
+    objects (which json_normalize would flatten further) become None.
+    Lists of objects are joined into comma separated strings of object's key values
+    
+    Arguments:
+        json_data (json): list of JSON objects
+        compiled_columns (list): result of compile_json_columns
+    Returns:
+        dict: column -> list of values
+    """
+    rows_count = len(json_data)
+    columns = {col: [None] * rows_count for col, _, _ in compiled_columns}
+    extractors = [(columns[col], path, item_key) for col, path, item_key in compiled_columns]
+    for row, item in enumerate(json_data):
+        for values, path, item_key in extractors:
+            value = item
+            for key in path:
+                if type(value) is not dict:
+                    value = None
+                    break
+                value = value.get(key)
+            if item_key is not None:
+                if type(value) is list:
+                    values[row] = ', '.join(element[item_key] for element in value)
+            elif type(value) is not dict:
+                values[row] = value
+    return columns
+
+ISSUES_JSON_COLUMNS = compile_json_columns(
+    issues_columns, issues_list_columns, ['organization_id'] + issues_iso_duration_columns)
+
+ISSUE_CHANGELOG_JSON_COLUMNS = compile_json_columns(
+    issue_changelog_columns, constant_columns=('organization_id', 'field_display', 'from_display', 'to_display'))
+#Top level fields of Tracker records used by the loader, other fields are dropped right after decoding
+TRACKER_ISSUE_FIELDS = frozenset(path[0] for _, path, _ in ISSUES_JSON_COLUMNS) | {'id', 'key', 'version', 'updatedAt'}
+TRACKER_CHANGELOG_FIELDS = frozenset(path[0] for _, path, _ in ISSUE_CHANGELOG_JSON_COLUMNS) | {'fields'}
+
 def shape_issues_data(json_data):
     """
-    Convert json data to Pandas dataframe and add 'org_id' column
+    Convert json data to Pandas dataframe and add 'org_id' column.
+    Only issues_columns are extracted from json, other fields returned by Tracker are skipped
     
     Arguments:
         json_data (json): input JSON data
     Returns:
         Pandas dataframe object with records
     """
-    raw_df = pd.json_normalize(json_data, sep='_', max_level=2)
-    raw_df.insert(0, 'organization_id', os.environ['TRACKER_ORG_ID'])
-    
-    #function to transform boards column from list of dictionaries 
-    #to simple comma separated string
-    def format_boards_column(item):
-        if (type(item)==list):
-            s=''
-            for i in range(len(item)):
-                s += item[i]['name']
-                if i < len(item)-1:
-                    s += ', '
-            return s
-    #function to transform components column from list of dictionaries 
-    #to simple comma separated string
-    def format_components_column(item):
-        if (type(item)==list):
-            s=''
-            for i in range(len(item)):
-                s += item[i]['display']
-                if i < len(item)-1:
-                    s += ', '
-            return s
-    #function to transform sprint column from list of dictionaries 
-    #to simple comma separated string
-    def format_sprint_column(item):
-        if (type(item)==list):
-            s=''
-            for i in range(len(item)):
-                s += item[i]['display']
-                if i < len(item)-1:
-                    s += ', '
-            return s
-    
-    def calculate_iso8601_duration(item):
-        try:
-            duration_obj = parse_duration(item)
-            duration =  duration_obj.date.years * 60*8*20*12 + duration_obj.date.months * 60*8*20
-            duration += duration_obj.date.days  * 60*8       + duration_obj.date.weeks  * 60*40
-            duration += duration_obj.time.hours * 60         + duration_obj.time.minutes
-        except TypeError:
-            duration = 0
-        return duration
+    columns = extract_json_columns(json_data, ISSUES_JSON_COLUMNS)
+    columns['organization_id'] = [os.environ['TRACKER_ORG_ID']] * len(json_data)
+    shaped_df = pd.DataFrame(columns, columns=issues_columns)
 
-    try:
-        raw_df['boards_names'] = raw_df['boards'].apply(format_boards_column)
-    except KeyError:
-        pass
-    try:
-        raw_df['components_display'] = raw_df['components'].apply(format_components_column)
-    except KeyError:
-        pass
-    try:
-        raw_df['sprint_display'] = raw_df['sprint'].apply(format_sprint_column)
-    except KeyError:
-        pass
-    try:
-        raw_df['originalEstimation'] = raw_df['originalEstimation'].apply(calculate_iso8601_duration)
-    except KeyError:
-        pass
-    try:
-        raw_df['spent'] = raw_df['spent'].apply(calculate_iso8601_duration)
-    except KeyError:
-        pass
-    try:
-        raw_df['estimation'] = raw_df['estimation'].apply(calculate_iso8601_duration)
-    except KeyError:
-        pass
-
-    #filter out unnecessary colums
-    shaped_df = pd.DataFrame(columns=issues_columns)
-    for col in issues_columns:
-        try:
-            shaped_df[col] = raw_df[col]
-        except KeyError as cerr:
-            shaped_df[col] = ""
+    #missing durations are 0 minutes, but their ISO columns stay empty
+    for col in issues_duration_columns:
+        duration_missing = shaped_df[col].isna()
+        shaped_df[col] = durations_to_minutes(shaped_df[col], WORKING_CALENDAR)
+        shaped_df[col + '_iso'] = minutes_to_durations(shaped_df[col].mask(duration_missing), WORKING_CALENDAR)
 
     #reformat dateTime columns
-    #List of columns with dateTime data format
-    date_time_columns: List[str] = [
-        'statusStartTime',
-        'createdAt',
-        'updatedAt',
-        'lastCommentUpdatedAt',
-        'start',
-        'end',
-        'resolvedAt'
-    ]
-    #Round dateTime columns up to seconds
-    for col in date_time_columns:
-        shaped_df[col] = pd.to_datetime(shaped_df[col]).dt.tz_localize(None).fillna('1970-01-01 00:00:00.000') #.round('S')
-        #apply Lambda fuction to each datetime column to unify datetime sting representation - trim tast 3 symbols of microseconds
-        shaped_df[col] = shaped_df[col].apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])
+    for col in issues_date_time_columns:
+        shaped_df[col] = normalize_date_time_column(shaped_df[col])
 
 
     #reformat decimal columns
-    #List of columns with decimal data format
-    decimal_columns: List[str] = [
-        'storyPoints',
-        'commentWithExternalMessageCount',
-        'commentWithoutExternalMessageCount',
-        'votes',
-        'checklistDone',
-        'checklistTotal'
-    ]
     #Round dateTime columns up to 2 digits after comma
-    for col in decimal_columns:
+    for col in issues_numeric_columns:
         shaped_df[col] = pd.to_numeric(shaped_df[col]).round(10)
 
     return shaped_df
 
-def shape_issue_changelog_data(json_data):
+def get_changelog_field_value(field_change, direction, display_fields):
     """
-    Convert issues changelog json data to Pandas dataframe
+    Get value of changed field before ('from') or after ('to') the change.
+    For fields in display_fields value is an object and its 'display' is returned
     
     Arguments:
-        json_data (json): input JSON data
+        field_change (dict): item of changelog record 'fields' list
+        direction (str): 'from' or 'to'
+        display_fields (set): ids of fields with object values
     Returns:
-        Pandas dataframe object with records
+        field value, empty string if value is missing
     """
-    raw_df = pd.json_normalize(json_data, sep='_', max_level=2)
-    raw_df.insert(0, 'organization_id', os.environ['TRACKER_ORG_ID'])
-    #expand list in the 'fields' field to duplicate rows
-    raw_df = raw_df.explode('fields')
+    value = field_change.get(direction, '')
+    field = field_change.get('field')
+    if type(field) is dict and field.get('id') in display_fields:
+        if type(value) is not dict:
+            return ''
+        return value.get('display', '')
+    return value
 
-    #get (fields -> field -> display) data
-    def get_field_display(item):
-        s = item['field']['display']
-        return s
+def iter_issue_changelog_rows(json_data, display_fields=TRACKER_CHANGELOG_DISPLAY_FIELDS):
+    """
+    Flatten changelog records to rows of issue_changelog_columns in one pass:
+    one row per item of record 'fields' list (or one row with empty field values
+    for records without fields), record level values are extracted once per record
+    
+    Arguments:
+        json_data (json): changelog records
+        display_fields (set): ids of fields with object values, see get_changelog_field_value
+    Returns:
+        generator of tuples with values in the order of issue_changelog_columns
+    """
+    organization_id = os.environ['TRACKER_ORG_ID']
+    #paths of 'id', 'issue_key', 'updatedAt', 'updatedBy_display', 'type', 'worklog' columns
+    entry_paths = [path for _, path, _ in ISSUE_CHANGELOG_JSON_COLUMNS]
+    for entry in json_data:
+        changelog_id, issue_key, updated_at, updated_by, change_type, worklog = [
+            get_json_value(entry, path) for path in entry_paths]
+        fields = entry.get('fields')
+        if not fields:
+            yield (organization_id, changelog_id, issue_key, updated_at, updated_by, change_type, None, '', '', worklog)
+            continue
+        for field_change in fields:
+            field = field_change.get('field')
+            field_display = field.get('display') if type(field) is dict else None
+            yield (organization_id, changelog_id, issue_key, updated_at, updated_by, change_type, field_display,
+                   get_changelog_field_value(field_change, 'from', display_fields),
+                   get_changelog_field_value(field_change, 'to', display_fields),
+                   worklog)
 
-    #get (fields -> from -> display) data
-    def get_from_display(item):
-        try: 
-            if item['field']['id'] in ('status', 'resolution', 'assignee') :
-                s = item['from']['display']
-            else:
-                s = item['from'] 
-        except: 
-            s = ''
-        return s
-
-    #get (fields -> to -> display) data
-    def get_to_display(item):
-        try: 
-            if item['field']['id'] in ('status', 'resolution', 'assignee'):
-                s = item['to']['display']
-            else:
-                s = item['to']
-        except: 
-            s = ''
-        return s
- 
-    raw_df['field_display'] = raw_df['fields'].apply(get_field_display)
-    raw_df['from_display'] = raw_df['fields'].apply(get_from_display)
-    raw_df['to_display'] = raw_df['fields'].apply(get_to_display)
-    
-    #filter our unnecessary columns
-    shaped_df = pd.DataFrame(columns=issue_changelog_columns)
-    for col in issue_changelog_columns:
-        try:
-            shaped_df[col] = raw_df[col]
-        except KeyError:
-            shaped_df[col] = ''
+def shape_issue_changelog_data(json_data):
+    """
+    Convert issues changelog json data to Pandas dataframe
+    
+    Arguments:
+        json_data (json): input JSON data
+    Returns:
+        Pandas dataframe object with records
+    """
+    shaped_df = pd.DataFrame.from_records(list(iter_issue_changelog_rows(json_data)), columns=issue_changelog_columns)
     
     #reformat dateTime columns
-    #List of columns with dateTime data format
-    date_time_columns: List[str] = [
-        'updatedAt'
-    ]   
-    #Round dateTime columns up to seconds
-    for col in date_time_columns:
-        shaped_df[col] = pd.to_datetime(shaped_df[col]).dt.tz_localize(None).fillna('1970-01-01 00:00:00.000') #.round('S')
-        #apply Lambda fuction to each datetime column to unify datetime sting representation - trim tast 3 symbols of microseconds
-        shaped_df[col] = shaped_df[col].apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])
+    for col in issue_changelog_date_time_columns:
+        shaped_df[col] = normalize_date_time_column(shaped_df[col])
 
     return shaped_df
 
+def iter_status_change_rows(json_data, status_field=TRACKER_STATUS_FIELD):
+    """
+    Extract changes of issue status from changelog records
+    
+    Arguments:
+        json_data (json): changelog records
+        status_field (str): id of changelog field with issue status
+    Returns:
+        generator of tuples (issue key, time of change, status before change, status after change)
+    """
+    status_fields = frozenset((status_field,))
+    issue_key_path, updated_at_path = [path for col, path, _ in ISSUE_CHANGELOG_JSON_COLUMNS if col in ('issue_key', 'updatedAt')]
+    for entry in json_data:
+        for field_change in entry.get('fields') or ():
+            field = field_change.get('field')
+            if type(field) is dict and field.get('id') == status_field:
+                yield (get_json_value(entry, issue_key_path), get_json_value(entry, updated_at_path),
+                       get_changelog_field_value(field_change, 'from', status_fields),
+                       get_changelog_field_value(field_change, 'to', status_fields))
+
+def shape_status_transitions(json_data, issues_df, stored_transitions={}):
+    """
+    Compute issue status transitions from changelog records: one row per status change
+    with the time spent in the left status and the time since issue creation.
+    The status left by the first change of an issue was entered at the previous change,
+    that is the latest transition stored by previous loads if it is earlier than the first change,
+    or at issue creation otherwise
+    
+    Arguments:
+        json_data (json): changelog records
+        issues_df (Dataframe): shaped issues of the changelog, source of issue creation time
+        stored_transitions (dict): issue key -> time of the latest stored transition
+    Returns:
+        Pandas dataframe object with status_transitions_columns
+    """
+    changes_df = pd.DataFrame.from_records(list(iter_status_change_rows(json_data)),
+        columns=['issue_key', 'left_at', 'from_status', 'to_status'])
+    if len(changes_df) == 0:
+        return pd.DataFrame(columns=status_transitions_columns)
+    changes_df['left_at'] = normalize_date_time_column(changes_df['left_at'])
+    #changelog of issue loaded twice in one run gives the same changes, table keeps one row per (issue_key, left_at)
+    changes_df = changes_df.drop_duplicates(['issue_key', 'left_at'], keep='last')
+    changes_df = changes_df.sort_values(['issue_key', 'left_at'], kind='stable', ignore_index=True)
+
+    created_at = changes_df['issue_key'].map(issues_df.drop_duplicates('key', keep='last').set_index('key')['createdAt'])
+    created_at = created_at.fillna('1970-01-01 00:00:00.000')
+    stored_left_at = changes_df['issue_key'].map(stored_transitions).fillna('')
+    #'YYYY-MM-DD hh:mm:ss.fff' strings are compared the same way as times
+    first_entered_at = stored_left_at.where((stored_left_at != '') & (stored_left_at < changes_df['left_at']), created_at)
+    entered_at = changes_df.groupby('issue_key', sort=False)['left_at'].shift(1)
+    changes_df['entered_at'] = entered_at.where(entered_at.notna(), first_entered_at)
+
+    date_time_format = '%Y-%m-%d %H:%M:%S.%f'
+    left_at = pd.to_datetime(changes_df['left_at'], format=date_time_format)
+    changes_df['minutes_in_status'] = (left_at - pd.to_datetime(changes_df['entered_at'], format=date_time_format)).dt.total_seconds() / 60
+    changes_df['minutes_from_created'] = (left_at - pd.to_datetime(created_at, format=date_time_format)).dt.total_seconds() / 60
+    return changes_df[status_transitions_columns]
+
+def get_stored_status_transitions(issue_keys):
+    """
+    Get time of the latest status transition of issues stored in database by the previous loads.
+    Keys are queried in bulk, one query per chunk of keys
+    
+    Arguments:
+        issue_keys (list): Yandex Tracker issue keys
+    Returns:
+        dict: issue key -> 'YYYY-MM-DD hh:mm:ss.fff' time, only for issues with stored transitions
+    """
+    stored_transitions = {}
+    for i in range(0, len(issue_keys), CH_STATE_QUERY_CHUNK_SIZE):
+        keys_list = ', '.join(quote_clickhouse_string(key) for key in issue_keys[i:i+CH_STATE_QUERY_CHUNK_SIZE])
+        transitions_query = '''
+            SELECT issue_key, max(left_at)
+            FROM ''' + CH_STATUS_TRANSITIONS_TABLE + ''' WHERE issue_key IN (''' + keys_list + ''')
+            GROUP BY issue_key
+            FORMAT TabSeparated
+        '''
+        response = run_clickhouse_query(transitions_query)
+        for line in response.splitlines():
+            key, left_at = line.split('\t')
+            stored_transitions[key] = left_at
+    return stored_transitions
+
+def get_status_transitions(changelog_json_data, issues_df, incremental=TRACKER_INCREMENTAL_CHANGELOG):
+    """
+    Compute status transitions of loaded changelog, see shape_status_transitions.
+    In incremental mode changelog starts after the latest stored record,
+    so the latest stored transitions of issues are queried from database
+    
+    Arguments:
+        changelog_json_data (json): changelog records
+        issues_df (Dataframe): shaped issues of the changelog
+        incremental (bool): changelog is loaded in incremental mode
+    Returns:
+        Pandas dataframe object with status_transitions_columns
+    """
+    stored_transitions = {}
+    if incremental and len(changelog_json_data) > 0:
+        issue_keys = {issue_key for issue_key, _, _, _ in iter_status_change_rows(changelog_json_data)}
+        stored_transitions = get_stored_status_transitions(sorted(issue_keys))
+    return shape_status_transitions(changelog_json_data, issues_df, stored_transitions)
+
 def init_database(drop_table=False):
     """
     Initialise Clickhouse DB: Dropping & CReating table with columns
@@ -406,96 +1422,57 @@ def init_database(drop_table=False):
         drop_issues_table_query = '''drop table if exists ''' + CH_ISSUES_TABLE + ''';'''
         run_clickhouse_query(drop_issues_table_query)
 
-    create_issues_table_query = '''
-        CREATE TABLE IF NOT EXISTS {db}.''' + CH_ISSUES_TABLE + '''
-        (
-            organization_id                     String,
-            self                                String,
-            id                                  String,
-            key                                 String,
-            version                             String,
-            storyPoints                         Decimal(15,2),
-            summary                             String,
-            statusStartTime                     DateTime64(3, 'Europe/Moscow'),
-            boards_names                        String,
-            createdAt                           DateTime64(3, 'Europe/Moscow'),
-            commentWithoutExternalMessageCount  Decimal(15,2),
-            votes                               Decimal(15,2),
-            commentWithExternalMessageCount     Decimal(15,2),
-            deadline                            String,
-            updatedAt                           DateTime64(3, 'Europe/Moscow'),
-            favorite                            String,
-            updatedBy_display                   String,
-            type_display                        String,
-            priority_display                    String,
-            createdBy_display                   String,
-            assignee_display                    String,
-            queue_key                           String,
-            queue_display                       String,
-            status_display                      String,
-            previousStatus_display              String,
-            parent_key                          String,
-            parent_display                      String,
-            components_display                  String,
-            sprint_display                      String,
-            epic_display                        String,
-            previousStatusLastAssignee_display  String,
-            originalEstimation                  Decimal(15,2),
-            spent                               Decimal(15,2),
-            tags                                String,
-            estimation                          Decimal(15,2),
-            checklistDone                       Decimal(15,2),
-            checklistTotal                      Decimal(15,2),
-            emailCreatedBy                      String,
-            sla                                 String,
-            emailTo                             String,
-            emailFrom                           String,
-            lastCommentUpdatedAt                DateTime64(3, 'Europe/Moscow'),
-            followers                           String,
-            pendingReplyFrom                    String,
-            end                                 DateTime64(3, 'Europe/Moscow'),
-            start                               DateTime64(3, 'Europe/Moscow'),
-            project_display                     String,
-            votedBy_display                     String,
-            aliases                             String,
-            previousQueue_display               String,
-            access                              String,
-            resolvedAt                          DateTime64(3, 'Europe/Moscow'),
-            resolvedBy_display                  String,
-            resolution_display                  String,
-            lastQueue_display                   String
-        )
-        ENGINE = ReplacingMergeTree()  
-        ORDER BY (id) 
-        '''
-    create_issues_table_query = create_issues_table_query.format(db=os.environ['CH_DB'])  
-    run_clickhouse_query(create_issues_table_query)
+    create_table_with_profile(CH_ISSUES_TABLE, ISSUES_TABLE_SCHEMA, CH_ISSUES_LATEST_TABLE)
 
     #issues changelog data
     if (drop_table):
         drop_changelog_table_query = '''drop table if exists ''' + CH_CHANGELOG_TABLE + ''';'''
         run_clickhouse_query(drop_changelog_table_query)
 
-    create_changelog_table_query = '''
-        CREATE TABLE IF NOT EXISTS {db}.''' + CH_CHANGELOG_TABLE + '''
+    create_table_with_profile(CH_CHANGELOG_TABLE, ISSUE_CHANGELOG_TABLE_SCHEMA, CH_CHANGELOG_LATEST_TABLE)
+
+    #loader state: checkpoints & changelog marks
+    create_state_table_query = '''
+        CREATE TABLE IF NOT EXISTS {db}.''' + CH_STATE_TABLE + '''
+        (
+            name                                String,
+            value                               String,
+            updatedAt                           DateTime64(3, 'Europe/Moscow')
+        )
+        ENGINE = ReplacingMergeTree(updatedAt)
+        ORDER BY (name)
+        '''
+    create_state_table_query = create_state_table_query.format(db=os.environ['CH_DB'])
+    run_clickhouse_query(create_state_table_query)
+    #watermark & checkpoint of dropped tables would skip the initial load of history
+    if (drop_table):
+        reset_load_state()
+
+    #marks of dropped changelog would skip loading it again
+    if (drop_table):
+        drop_changelog_marks_table_query = '''drop table if exists ''' + CH_CHANGELOG_MARKS_TABLE + ''';'''
+        run_clickhouse_query(drop_changelog_marks_table_query)
+
+    create_changelog_marks_table_query = '''
+        CREATE TABLE IF NOT EXISTS {db}.''' + CH_CHANGELOG_MARKS_TABLE + '''
         (
-            organization_id                     String,
-            id                                  String,
             issue_key                           String,
-            updatedAt                           DateTime64(3, 'Europe/Moscow'),
-            updatedBy_display                   String,
-            type                                String,
-            field_display                       String,
-            from_display                        String,
-            to_display                          String,
-            worklog                             String
+            version                             String,
+            changelog_id                        String,
+            updatedAt                           DateTime64(3, 'Europe/Moscow')
         )
-        ENGINE = ReplacingMergeTree()  
-        ORDER BY (id, field_display) 
+        ENGINE = ReplacingMergeTree(updatedAt)
+        ORDER BY (issue_key)
         '''
-    create_changelog_table_query = create_changelog_table_query.format(db=os.environ['CH_DB'])    
-    run_clickhouse_query(create_changelog_table_query)
+    create_changelog_marks_table_query = create_changelog_marks_table_query.format(db=os.environ['CH_DB'])
+    run_clickhouse_query(create_changelog_marks_table_query)
     
+    #latest versions of issues & changelog records, views read them instead of ranking whole history
+    create_latest_state_table(CH_ISSUES_TABLE, CH_ISSUES_LATEST_TABLE, '(id)', drop_table)
+    create_latest_state_table(CH_CHANGELOG_TABLE, CH_CHANGELOG_LATEST_TABLE, '(organization_id, id, field_display)', drop_table)
+
+    create_status_transitions_table(drop_table)
+
     create_issues_view = '''
         CREATE OR REPLACE VIEW {db}.v_tracker_issues AS
         SELECT organization_id, `self`, id, `key`, version, storyPoints, 
@@ -512,26 +1489,8 @@ def init_database(drop_table=False):
         pendingReplyFrom, `end`, `start`, project_display, 
         votedBy_display, aliases, previousQueue_display, access, 
         resolvedAt, resolvedBy_display, resolution_display, 
-        lastQueue_display
-        FROM (
-            SELECT organization_id, `self`, id, `key`, version, storyPoints, 
-            summary, statusStartTime, boards_names, createdAt, 
-            commentWithoutExternalMessageCount, votes, 
-            commentWithExternalMessageCount, deadline, updatedAt, favorite, 
-            updatedBy_display, type_display, priority_display, 
-            createdBy_display, assignee_display, queue_key, queue_display, 
-            status_display, previousStatus_display, parent_key, parent_display, 
-            components_display, sprint_display, epic_display, 
-            previousStatusLastAssignee_display, originalEstimation, spent, 
-            tags, estimation, checklistDone, checklistTotal, emailCreatedBy,
-            sla, emailTo, emailFrom, lastCommentUpdatedAt, followers, 
-            pendingReplyFrom, `end`, `start`, project_display, 
-            votedBy_display, aliases, previousQueue_display, access, 
-            resolvedAt, resolvedBy_display, resolution_display, 
-            lastQueue_display,
-            row_number() over (partition by id order by updatedAt desc) as lvl
-            FROM {db}.''' + CH_ISSUES_TABLE + '''
-        ) T WHERE T.lvl = 1;
+        lastQueue_display, originalEstimation_iso, spent_iso, estimation_iso
+        FROM {db}.''' + CH_ISSUES_LATEST_TABLE + ''' FINAL;
     '''
     create_issues_view = create_issues_view.format(db=os.environ['CH_DB'])
     run_clickhouse_query(create_issues_view)
@@ -540,50 +1499,279 @@ def init_database(drop_table=False):
         CREATE OR REPLACE VIEW v_tracker_changelog AS
         SELECT id, issue_key, updatedAt, updatedBy_display, `type`,
         field_display, from_display, to_display, worklog
-        FROM (
-            SELECT organization_id, id, issue_key, updatedAt, updatedBy_display, `type`,
-            field_display, from_display, to_display, worklog,
-            row_number() over (partition by organization_id, id, field_display order by updatedAt desc) as lvl
-            FROM {db}.''' + CH_CHANGELOG_TABLE + '''
-        ) T WHERE T.lvl = 1;
+        FROM {db}.''' + CH_CHANGELOG_LATEST_TABLE + ''' FINAL;
     '''
     create_changelog_view = create_changelog_view.format(db=os.environ['CH_DB'])
     run_clickhouse_query(create_changelog_view)
 
+    #previous status change is taken with window function, not with self join of changelog
     create_open_issues_view = '''
         create or replace view {db}.v_tracker_statuses as (
             select c.issue_key as issue_key,
             i.createdAt as issueCreated,
             c.updatedAt as toStatusTimestamp,
-            c2.updatedAt as fromStatusTimestamp,
+            if (c.statusNumber = 1, NULL, c.previousUpdatedAt) as fromStatusTimestamp,
             if (
                 c.from_display = 'Открыт'
-                and year(c2.updatedAt) = 1970,
+                and c.statusNumber = 1,
                 0,
                 (
-                toUnixTimestamp(c.updatedAt) - toUnixTimestamp(c2.updatedAt)
+                toUnixTimestamp(c.updatedAt) - toUnixTimestamp(fromStatusTimestamp)
                 ) / 60
             ) as fromPrevious,
             c.from_display as fromStatus,
             c.to_display as toStatus,
             (
-                toUnixTimestamp(c.updatedAt) - toUnixTimestamp(c.createdAt)
+                toUnixTimestamp(c.updatedAt) - toUnixTimestamp(i.createdAt)
             ) / 60 as fromCreated
-            from {db}.v_tracker_changelog c
-            join {db}.v_tracker_issues i on c.issue_key = i.key asof
-            left join {db}.v_tracker_changelog c2 on c.issue_key = c2.issue_key
-            and c.type = c2.type
-            and c.field_display = c2.field_display
-            and c.updatedAt > c2.updatedAt
-            where c.type = 'IssueWorkflow'
-            and c.field_display = 'Статус'
+            from (
+                select issue_key, updatedAt, from_display, to_display,
+                row_number() over w as statusNumber,
+                lagInFrame(updatedAt) over w as previousUpdatedAt
+                from {db}.v_tracker_changelog
+                where type = 'IssueWorkflow'
+                and field_display = 'Статус'
+                window w as (partition by issue_key order by updatedAt rows between unbounded preceding and unbounded following)
+            ) c
+            join {db}.v_tracker_issues i on c.issue_key = i.key
             order by c.issue_key,
             c.updatedAt
-        ) settings join_use_nulls = 1
+        )
     '''
     create_open_issues_view = create_open_issues_view.format(db=os.environ['CH_DB'])    
     run_clickhouse_query(create_open_issues_view)
 
+def create_status_transitions_table(drop_table=False, status_field_display=TRACKER_STATUS_FIELD_DISPLAY):
+    """
+    Create table with issue status transitions. New table is filled once from changelog & issues
+    loaded before, the same way shape_status_transitions computes transitions of loaded changelog,
+    so issues which are not updated anymore have their transitions and the first transition
+    loaded later follows the stored one. Latest-state tables must exist, see create_latest_state_table
+    
+    Arguments:
+        drop_table (Boleean): flag to indcate tha Dropping table is needed
+        status_field_display (str): display name of the status field in changelog table
+    Returns:
+        Nothing
+    """
+    db = os.environ['CH_DB']
+    if (drop_table):
+        drop_status_transitions_table_query = '''drop table if exists ''' + CH_STATUS_TRANSITIONS_TABLE + ''';'''
+        run_clickhouse_query(drop_status_transitions_table_query)
+
+    create_status_transitions_table_query = '''
+        CREATE TABLE IF NOT EXISTS {db}.''' + CH_STATUS_TRANSITIONS_TABLE + '''
+        (
+            issue_key                           String,
+            from_status                         String,
+            to_status                           String,
+            entered_at                          DateTime64(3, 'Europe/Moscow'),
+            left_at                             DateTime64(3, 'Europe/Moscow'),
+            minutes_in_status                   Decimal(15,2),
+            minutes_from_created                Decimal(15,2)
+        )
+        ENGINE = ReplacingMergeTree()
+        ORDER BY (issue_key, left_at)
+        '''
+    table_exists = run_clickhouse_query('EXISTS TABLE {db}.{table}'.format(db=db, table=CH_STATUS_TRANSITIONS_TABLE)).strip() == '1'
+    create_status_transitions_table_query = create_status_transitions_table_query.format(db=db)
+    run_clickhouse_query(create_status_transitions_table_query)
+    if table_exists:
+        return
+
+    #the first transition of issue left the status entered at issue creation
+    backfill_status_transitions_query = '''
+        INSERT INTO {db}.''' + CH_STATUS_TRANSITIONS_TABLE + '''
+        (issue_key, from_status, to_status, entered_at, left_at, minutes_in_status, minutes_from_created)
+        SELECT issue_key, from_status, to_status, entered_at, left_at,
+        round((toUnixTimestamp64Milli(left_at) - toUnixTimestamp64Milli(entered_at)) / 60000, 2),
+        round((toUnixTimestamp64Milli(left_at) - toUnixTimestamp64Milli(created_at)) / 60000, 2)
+        FROM (
+            SELECT issue_key, from_status, to_status, left_at, created_at,
+            if(statusNumber = 1, created_at, previousLeftAt) AS entered_at
+            FROM (
+                SELECT c.issue_key AS issue_key, c.from_display AS from_status, c.to_display AS to_status,
+                c.updatedAt AS left_at, i.createdAt AS created_at,
+                row_number() OVER w AS statusNumber,
+                lagInFrame(c.updatedAt) OVER w AS previousLeftAt
+                FROM {db}.''' + CH_CHANGELOG_LATEST_TABLE + ''' AS c FINAL
+                LEFT JOIN (
+                    SELECT `key`, createdAt FROM {db}.''' + CH_ISSUES_LATEST_TABLE + ''' FINAL
+                ) AS i ON c.issue_key = i.`key`
+                WHERE c.field_display = ''' + quote_clickhouse_string(status_field_display) + '''
+                WINDOW w AS (PARTITION BY c.issue_key ORDER BY c.updatedAt, c.id ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+            )
+        )
+        '''
+    run_clickhouse_query(backfill_status_transitions_query.format(db=db))
+
+def get_create_table_query(table_name, schema, profile=CH_SCHEMA_PROFILE):
+    """
+    Build query creating ReplacingMergeTree table for loaded data.
+    'legacy' profile: String, DateTime64(3) & Decimal(15,2) columns, table ordered by record key.
+    'tuned' profile adds updatedAt as version column, so the latest version is kept on merges
+    regardless of insert order, monthly partitions, LowCardinality dictionaries, Delta & ZSTD codecs
+    and bloom filter skip indexes. Profile is saved in table comment
+    
+    Arguments:
+        table_name (str): table to create
+        schema (dict): columns & keys of the table, see ISSUES_TABLE_SCHEMA
+        profile (str): 'legacy' or 'tuned'
+    Returns:
+        query string
+    """
+    if profile not in ('legacy', 'tuned'):
+        raise ValueError('Unknown schema profile: ' + profile)
+    tuned = profile == 'tuned'
+    column_definitions = []
+    for col in schema['columns']:
+        column_definitions.append('{col:<36}{col_type}'.format(col=col, col_type=get_column_type(col, schema, profile)))
+    if tuned:
+        for col in schema['index_columns']:
+            column_definitions.append('INDEX {col}_idx {col} TYPE bloom_filter GRANULARITY 4'.format(col=col))
+
+    create_table_query = '''
+        CREATE TABLE IF NOT EXISTS {db}.''' + table_name + '''
+        (
+            ''' + ',\n            '.join(column_definitions) + '''
+        )
+        '''
+    if tuned:
+        create_table_query += '''ENGINE = ReplacingMergeTree(updatedAt)
+        PARTITION BY toYYYYMM(''' + schema['partition_by'] + ''')
+        ORDER BY ''' + schema['order_by'] + '''
+        COMMENT 'schema_profile=tuned'
+        '''
+    else:
+        create_table_query += '''ENGINE = ReplacingMergeTree()
+        ORDER BY ''' + schema['order_by'] + '''
+        '''
+    return create_table_query.format(db=os.environ['CH_DB'])
+
+def get_column_type(col, schema, profile=CH_SCHEMA_PROFILE):
+    """
+    Get database type of table column in schema profile, see get_create_table_query
+    """
+    tuned = profile == 'tuned'
+    if col in schema['date_time_columns']:
+        return "DateTime64(3, 'Europe/Moscow')" + (' CODEC(Delta, ZSTD(1))' if tuned else '')
+    if col in schema['decimal_columns']:
+        return 'Decimal(15,2)' + (' CODEC(ZSTD(1))' if tuned else '')
+    if tuned and col in schema['low_cardinality_columns']:
+        return 'LowCardinality(String)'
+    if tuned and col in schema['text_columns']:
+        return 'String CODEC(ZSTD(3))'
+    return 'String'
+
+def add_table_columns(table_name, schema, profile=CH_SCHEMA_PROFILE):
+    """
+    Add columns of schema which were introduced after the table was created.
+    Columns are added to the end of the table, the same place they have in the schema,
+    existing columns are left as they are
+    
+    Arguments:
+        table_name (str): existing table
+        schema (dict): columns & keys of the table, see ISSUES_TABLE_SCHEMA
+        profile (str): schema profile of existing table, 'legacy' or 'tuned'
+    Returns:
+        Nothing
+    """
+    add_columns_query = 'ALTER TABLE {db}.' + table_name + ' ' + ', '.join(
+        'ADD COLUMN IF NOT EXISTS `' + col + '` ' + get_column_type(col, schema, profile)
+        for col in schema['added_columns'])
+    run_clickhouse_query(add_columns_query.format(db=os.environ['CH_DB']))
+
+def get_table_schema_profile(table_name):
+    """
+    Get schema profile of existing table from its comment
+    """
+    table_comment_query = '''
+        SELECT comment FROM system.tables
+        WHERE database = currentDatabase() AND name = ''' + quote_clickhouse_string(table_name) + '''
+        FORMAT TabSeparatedRaw
+    '''
+    table_comment = run_clickhouse_query(table_comment_query).strip()
+    return table_comment[len('schema_profile='):] if table_comment.startswith('schema_profile=') else 'legacy'
+
+def create_table_with_profile(table_name, schema, latest_table, profile=CH_SCHEMA_PROFILE):
+    """
+    Create table with schema of profile, see get_create_table_query. Existing table of other profile
+    is migrated: data is copied to new table which is then exchanged with existing one.
+    Columns added to schema later are added to existing table & its latest-state table.
+    Latest-state table of migrated table is dropped to be recreated & refilled by create_latest_state_table
+    
+    Arguments:
+        table_name (str): table to create
+        schema (dict): columns & keys of the table
+        latest_table (str): latest-state table filled from the table
+        profile (str): 'legacy' or 'tuned'
+    Returns:
+        Nothing
+    """
+    run_clickhouse_query(get_create_table_query(table_name, schema, profile))
+    table_profile = get_table_schema_profile(table_name)
+    #tables created by previous releases get new columns first, so they can be migrated & read by views
+    if schema['added_columns']:
+        add_table_columns(table_name, schema, table_profile)
+        latest_table_exists = run_clickhouse_query('EXISTS TABLE {db}.{table}'.format(
+            db=os.environ['CH_DB'], table=latest_table)).strip() == '1'
+        if latest_table_exists:
+            add_table_columns(latest_table, schema, table_profile)
+    if table_profile == profile:
+        return
+
+    print(datetime.now(), 'Migrating table', table_name, 'from', table_profile, 'to', profile, 'schema')
+    db = os.environ['CH_DB']
+    migration_table = table_name + '_migration'
+    columns_list = ', '.join('`' + col + '`' for col in schema['columns'])
+    run_clickhouse_query('drop table if exists {db}.{table};'.format(db=db, table=migration_table))
+    run_clickhouse_query(get_create_table_query(migration_table, schema, profile))
+    run_clickhouse_query('INSERT INTO {db}.{migration_table} ({columns}) SELECT {columns} FROM {db}.{table}'.format(
+        db=db, migration_table=migration_table, table=table_name, columns=columns_list))
+    run_clickhouse_query('drop view if exists {db}.mv_{table};'.format(db=db, table=latest_table))
+    run_clickhouse_query('drop table if exists {db}.{table};'.format(db=db, table=latest_table))
+    run_clickhouse_query('EXCHANGE TABLES {db}.{table} AND {db}.{migration_table}'.format(
+        db=db, table=table_name, migration_table=migration_table))
+    run_clickhouse_query('drop table {db}.{table};'.format(db=db, table=migration_table))
+
+def create_latest_state_table(base_table, latest_table, order_by, drop_table=False):
+    """
+    Create table with the latest version of base table records: ReplacingMergeTree versioned on updatedAt,
+    filled by materialized view on every insert into base table. Records loaded before the table
+    was created are copied once, when it is created
+    
+    Arguments:
+        base_table (str): table loaded with Tracker data
+        latest_table (str): table with the latest versions of records
+        order_by (str): key of the record
+        drop_table (Boleean): flag to indcate tha Dropping table is needed
+    Returns:
+        Nothing
+    """
+    db = os.environ['CH_DB']
+    if (drop_table):
+        run_clickhouse_query('drop view if exists {db}.mv_{table};'.format(db=db, table=latest_table))
+        run_clickhouse_query('drop table if exists {db}.{table};'.format(db=db, table=latest_table))
+
+    table_exists = run_clickhouse_query('EXISTS TABLE {db}.{table}'.format(db=db, table=latest_table)).strip() == '1'
+    if not table_exists:
+        create_latest_table_query = '''
+            CREATE TABLE IF NOT EXISTS {db}.{latest_table} AS {db}.{base_table}
+            ENGINE = ReplacingMergeTree(updatedAt)
+            ORDER BY {order_by}
+            '''
+        run_clickhouse_query(create_latest_table_query.format(db=db, latest_table=latest_table, base_table=base_table, order_by=order_by))
+
+    create_latest_view_query = '''
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {db}.mv_{latest_table} TO {db}.{latest_table}
+        AS SELECT * FROM {db}.{base_table}
+        '''
+    run_clickhouse_query(create_latest_view_query.format(db=db, latest_table=latest_table, base_table=base_table))
+
+    if not table_exists:
+        backfill_latest_table_query = 'INSERT INTO {db}.{latest_table} SELECT * FROM {db}.{base_table}'
+        run_clickhouse_query(backfill_latest_table_query.format(db=db, latest_table=latest_table, base_table=base_table))
+
 def run_clickhouse_query(query, connection_timeout=1500):
     """
     Exec clickhouse query
@@ -597,18 +1785,57 @@ def run_clickhouse_query(query, connection_timeout=1500):
         host=os.environ['CH_HOST'],
         db=os.environ['CH_DB'])
     #Run Clickhouse query, places in the body of POST request (Query string could be long and not fit in url string)
-    response = requests.post(url, data=query.encode('utf-8'), headers=AUTH, verify=CERT, timeout=connection_timeout)
+    response = get_http_session().post(url, data=query.encode('utf-8'), headers=AUTH, verify=CERT, timeout=connection_timeout)
     if response.status_code == 200:
         return response.text
     else:
         raise ValueError(response.text)
 
-def upload_clickhouse_data(data, table_name):
+def iter_compressed_data(data, compression, chunk_size=CH_INSERT_STREAM_CHUNK_SIZE):
+    """
+    Compress data piece by piece to stream it as request body with chunked transfer encoding
+    
+    Arguments:
+        data (bytes): data to compress
+        compression (str): 'gzip', 'zstd' or 'lz4'
+        chunk_size (int): size of uncompressed piece
+    Returns:
+        generator of compressed pieces
+    """
+    if compression == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        compress, flush = compressor.compress, compressor.flush
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ValueError('zstandard package is required for zstd compression')
+        compressor = zstandard.ZstdCompressor().compressobj()
+        compress, flush = compressor.compress, compressor.flush
+    elif compression == 'lz4':
+        if lz4 is None:
+            raise ValueError('lz4 package is required for lz4 compression')
+        compressor = lz4.frame.LZ4FrameCompressor()
+        yield compressor.begin()
+        compress, flush = compressor.compress, compressor.flush
+    else:
+        raise ValueError('Unknown compression: ' + compression)
+
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        compressed = compress(view[start:start+chunk_size])
+        if compressed:
+            yield compressed
+    yield flush()
+
+def upload_clickhouse_data(data, table_name, data_format='TabSeparatedWithNames', columns=None, compression=CH_INSERT_COMPRESSION):
     """
     Exec clickhouse query
     
     Arguments:
-        data (string): Data to be uploaded in CSV format
+        data (bytes): Data to be uploaded in data_format
+        table_name (str): table to insert data into
+        data_format (str): ClickHouse input format
+        columns (list): columns in the order of data, None for formats with names in the header
+        compression (str): request body compression, empty string to send data as is
     Returns:
         response from database
     """
@@ -617,10 +1844,19 @@ def upload_clickhouse_data(data, table_name):
         host=os.environ['CH_HOST'],
         db=os.environ['CH_DB'])
     """
+    insert_query = 'INSERT INTO ' + table_name
+    if columns is not None:
+        insert_query += ' (' + ', '.join('`' + col + '`' for col in columns) + ')'
     query_dict = {
-        'query': 'INSERT INTO ' + table_name + ' FORMAT TabSeparatedWithNames'
+        'query': insert_query + ' FORMAT ' + data_format
     }
-    response = requests.post(CH_URL, data=data, params=query_dict, headers=AUTH, verify=CERT)
+    headers = AUTH
+    if compression != '':
+        #compressed body is streamed as generator, so it is sent with chunked transfer encoding
+        data = iter_compressed_data(data, compression)
+        headers = dict(AUTH, **{'Content-Encoding': compression})
+        query_dict['enable_http_compression'] = 1
+    response = get_http_session().post(CH_URL, data=data, params=query_dict, headers=headers, verify=CERT, timeout=CH_INSERT_TIMEOUT)
     result = response.text
     if response.status_code == 200:
         return result
@@ -628,36 +1864,604 @@ def upload_clickhouse_data(data, table_name):
         print(response.text)
         raise ValueError(response.text)
 
-def upload_data_to_db(issues_df, changelog_df):
+def encode_varint(value):
+    """
+    Encode unsigned integer as LEB128 varint used for string lengths in ClickHouse binary formats
     """
-    Upload two datafarems to database
+    result = bytearray()
+    while value >= 0x80:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+#varints of string lengths shorter than 16K, which are almost all strings in Tracker data
+VARINT_CACHE = [encode_varint(i) for i in range(1 << 14)]
+
+def encode_row_binary_strings(series):
+    """
+    Encode column as RowBinary String values. Values are converted to text the same way
+    as by DataFrame.to_csv: missing values as empty strings, other objects with str()
+    
+    Arguments:
+        series (Series): column values
+    Returns:
+        list of encoded values, one per row
+    """
+    varint_cache = VARINT_CACHE
+    encoded = []
+    for value in series.tolist():
+        if value is None or value != value:
+            encoded.append(b'\x00')
+            continue
+        if not isinstance(value, str):
+            value = str(value)
+        value = value.encode('utf-8')
+        length = len(value)
+        if length < 16384:
+            encoded.append(varint_cache[length] + value)
+        else:
+            encoded.append(encode_varint(length) + value)
+    return encoded
+
+def split_int64_values(values):
+    """
+    Encode int64 array as little-endian 8 byte values
+    
+    Arguments:
+        values (numpy array): integer values
+    Returns:
+        list of encoded values, one per row
+    """
+    data = values.astype('<i8').tobytes()
+    return [data[i:i+8] for i in range(0, len(data), 8)]
+
+def encode_row_binary_date_times(series):
+    """
+    Encode column of 'YYYY-MM-DD hh:mm:ss.fff' strings as RowBinary DateTime64(3) values:
+    milliseconds since epoch of the time in CH_DATE_TIME_TIMEZONE, as ClickHouse would parse it from text
+    """
+    date_times = pd.to_datetime(series, format='%Y-%m-%d %H:%M:%S.%f')
+    date_times = date_times.dt.tz_localize(CH_DATE_TIME_TIMEZONE,
+        ambiguous=np.zeros(len(date_times), dtype=bool), nonexistent='shift_forward')
+    epoch_millis = date_times.dt.tz_convert(None).to_numpy().astype('datetime64[ms]').astype('int64')
+    return split_int64_values(epoch_millis)
+
+def encode_row_binary_decimals(series, scale=2):
+    """
+    Encode column as RowBinary Decimal64 values: numbers multiplied by 10^scale, missing values as 0.
+    Extra digits are truncated, as ClickHouse does parsing the number from text
+    """
+    numbers = pd.to_numeric(series, errors='coerce').fillna(0).to_numpy(dtype='float64')
+    scaled = numbers * 10 ** scale
+    #0.29 * 100 is 28.999999999999996, but it is 29 in text
+    nearest = np.round(scaled)
+    exact = np.abs(scaled - nearest) <= 1e-9 * np.maximum(np.abs(scaled), 1)
+    return split_int64_values(np.where(exact, nearest, np.trunc(scaled)))
+
+def encode_row_binary(df, date_time_columns=(), decimal_columns=()):
+    """
+    Serialize dataframe to ClickHouse RowBinary format. Columns are encoded one by one
+    with typed encoding of DateTime64(3) and Decimal(15,2) columns, all other columns are String.
+    No escaping is needed: strings are length-prefixed
+    
+    Arguments:
+        df (Dataframe): data to serialize
+        date_time_columns (list): columns with 'YYYY-MM-DD hh:mm:ss.fff' strings of DateTime64(3) type
+        decimal_columns (list): columns of Decimal(15,2) type
+    Returns:
+        bytes with rows in RowBinary format
+    """
+    encoded_columns = []
+    for col in df.columns:
+        if col in date_time_columns:
+            encoded_columns.append(encode_row_binary_date_times(df[col]))
+        elif col in decimal_columns:
+            encoded_columns.append(encode_row_binary_decimals(df[col]))
+        else:
+            encoded_columns.append(encode_row_binary_strings(df[col]))
+    return b''.join(chain.from_iterable(zip(*encoded_columns)))
+
+def serialize_dataframe(df, date_time_columns=(), decimal_columns=()):
+    """
+    Serialize dataframe to CH_INSERT_FORMAT
+    
+    Arguments:
+        df (Dataframe): data to serialize
+        date_time_columns (list): columns of DateTime64(3) type
+        decimal_columns (list): columns of Decimal(15,2) type
+    Returns:
+        tuple of serialized data, its format and list of columns (None if names are in data header)
+    """
+    if CH_INSERT_FORMAT == 'RowBinary':
+        content = encode_row_binary(df, date_time_columns, decimal_columns)
+        return content, 'RowBinary', list(df.columns)
+    #backslash escapes of tabs, new lines & backslashes in strings are read by TabSeparated format,
+    #quotes are written as is
+    content = df.to_csv(index=False, sep='\t', quoting=csv.QUOTE_NONE, escapechar='\\')
+    content = content.encode('utf-8')
+    return content, 'TabSeparatedWithNames', None
+
+def upload_dataframe_chunk(df, table_name, date_time_columns=(), decimal_columns=(), max_bytes=CH_INSERT_MAX_BYTES):
+    """
+    Serialize dataframe and upload it with one insert, or split it in halves
+    if serialized data is bigger than max_bytes
+    """
+    content, data_format, columns = serialize_dataframe(df, date_time_columns, decimal_columns)
+    if len(content) > max_bytes and len(df) > 1:
+        del content
+        middle = len(df) // 2
+        upload_dataframe_chunk(df.iloc[:middle], table_name, date_time_columns, decimal_columns, max_bytes)
+        upload_dataframe_chunk(df.iloc[middle:], table_name, date_time_columns, decimal_columns, max_bytes)
+        return
+    upload_clickhouse_data(content, table_name, data_format, columns)
+
+def upload_dataframe(df, table_name, date_time_columns=(), decimal_columns=(), max_rows=CH_INSERT_MAX_ROWS, max_bytes=CH_INSERT_MAX_BYTES):
+    """
+    Upload dataframe to database table with inserts of at most max_rows rows
+    and max_bytes bytes of serialized data each
+    
+    Arguments:
+        df (Dataframe): data to upload
+        table_name (str): table to insert data into
+        date_time_columns (list): columns of DateTime64(3) type
+        decimal_columns (list): columns of Decimal(15,2) type
+        max_rows (int): max number of rows in one insert
+        max_bytes (int): max size of serialized data in one insert
+    Returns:
+        Nothing
+    """
+    for start in range(0, len(df), max_rows):
+        upload_dataframe_chunk(df.iloc[start:start+max_rows], table_name, date_time_columns, decimal_columns, max_bytes)
+
+def upload_data_to_db(issues_df, changelog_df, transitions_df=None):
+    """
+    Upload datafarems to database
     
     Arguments:
         issues_df (Dataframe): dataframe with tracker data
         changelog_df (Dataframe): dataframe with issues changelog data
+        transitions_df (Dataframe): dataframe with issue status transitions
     Returns:
         Nothing
     """
     #init_database(drop_table=False)
-    #Prepare issues data to upload: escaping \n to allow fields with new lines be represented correctly in CSV format 
-    issues_content = issues_df.replace("\n", "\\\n", regex=True).to_csv(index=False, sep='\t')
-    issues_content = issues_content.encode('utf-8')
-    #Prepare changelog data to upload: escaping \n to allow fields with new lines be represented correctly in CSV format 
-    changelog_content = changelog_df.replace("\n", "\\\n", regex=True).to_csv(index=False, sep='\t')
-    changelog_content = changelog_content.encode('utf-8')   
-    upload_clickhouse_data(issues_content, CH_ISSUES_TABLE)
-    upload_clickhouse_data(changelog_content, CH_CHANGELOG_TABLE)
+    #changelog goes first: stored issue version marks its changelog as loaded for incremental mode
+    if len(changelog_df) > 0:
+        upload_dataframe(changelog_df, CH_CHANGELOG_TABLE, issue_changelog_date_time_columns)
+    if transitions_df is not None and len(transitions_df) > 0:
+        upload_dataframe(transitions_df, CH_STATUS_TRANSITIONS_TABLE,
+            status_transitions_date_time_columns, status_transitions_decimal_columns)
+    upload_dataframe(issues_df, CH_ISSUES_TABLE, issues_date_time_columns, issues_decimal_columns)
+
+def get_current_time_string():
+    """
+    Current UTC time as 'YYYY-MM-DD hh:mm:ss.fff' string, the same way Tracker timestamps are stored
+    """
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+def get_latest_updated_at(issues_df):
+    """
+    Get the latest update time of shaped issues, empty string if there are no issues
+    """
+    if len(issues_df) == 0:
+        return ''
+    #'YYYY-MM-DD hh:mm:ss.fff' strings are ordered the same way as times
+    return issues_df['updatedAt'].max()
+
+def upload_changelog_marks(marks):
+    """
+    Upload latest loaded version & changelog record of issues to CH_CHANGELOG_MARKS_TABLE.
+    Marks are uploaded after issues & changelog, so they never point beyond the data in database
+    
+    Arguments:
+        marks (dict): issue key -> tuple (version, latest changelog id)
+    Returns:
+        Nothing
+    """
+    if len(marks) == 0:
+        return
+    marks_df = pd.DataFrame.from_records(
+        [(key, version, changelog_id) for key, (version, changelog_id) in marks.items()],
+        columns=['issue_key', 'version', 'changelog_id'])
+    marks_df['updatedAt'] = get_current_time_string()
+    upload_dataframe(marks_df, CH_CHANGELOG_MARKS_TABLE, ['updatedAt'])
+
+def read_checkpoint(name, backend=TRACKER_CHECKPOINT_BACKEND):
+    """
+    Read value saved in checkpoint store
+    
+    Arguments:
+        name (str): checkpoint name
+        backend (str): 'clickhouse', 'file' or 'none'
+    Returns:
+        json object, None if checkpoint is not saved
+    """
+    if backend == 'file':
+        try:
+            with open(TRACKER_CHECKPOINT_FILE) as checkpoint_file:
+                return json.load(checkpoint_file).get(name)
+        except FileNotFoundError:
+            return None
+    elif backend == 'clickhouse':
+        checkpoint_query = '''
+            SELECT argMax(value, updatedAt) FROM ''' + CH_STATE_TABLE + '''
+            WHERE name = ''' + quote_clickhouse_string(name) + '''
+            GROUP BY name
+            FORMAT TabSeparatedRaw
+        '''
+        response = run_clickhouse_query(checkpoint_query).strip()
+        return json.loads(response) if response != '' else None
+    elif backend == 'none':
+        return None
+    raise ValueError('Unknown checkpoint backend: ' + backend)
+
+def reset_load_state(backend=TRACKER_CHECKPOINT_BACKEND):
+    """
+    Forget watermark & checkpoint of issues load, so the next load starts from TRACKER_INITIAL_HISTORY_DEPTH.
+    Empty values are saved over them, they are read the same way as never saved ones
+    
+    Arguments:
+        backend (str): 'clickhouse', 'file' or 'none'
+    Returns:
+        Nothing
+    """
+    for name in (CHECKPOINT_NAME, WATERMARK_NAME):
+        write_checkpoint(name, None, backend)
+
+def write_checkpoint(name, value, backend=TRACKER_CHECKPOINT_BACKEND):
+    """
+    Save value to checkpoint store
+    
+    Arguments:
+        name (str): checkpoint name
+        value (json): value to save
+        backend (str): 'clickhouse', 'file' or 'none'
+    Returns:
+        Nothing
+    """
+    if backend == 'file':
+        try:
+            with open(TRACKER_CHECKPOINT_FILE) as checkpoint_file:
+                checkpoints = json.load(checkpoint_file)
+        except FileNotFoundError:
+            checkpoints = {}
+        checkpoints[name] = value
+        #file is replaced at once, so interrupted write does not corrupt saved checkpoints
+        with open(TRACKER_CHECKPOINT_FILE + '.tmp', 'w') as checkpoint_file:
+            json.dump(checkpoints, checkpoint_file)
+        os.replace(TRACKER_CHECKPOINT_FILE + '.tmp', TRACKER_CHECKPOINT_FILE)
+    elif backend == 'clickhouse':
+        checkpoint_row = json.dumps({'name': name, 'value': json.dumps(value), 'updatedAt': get_current_time_string()})
+        upload_clickhouse_data(checkpoint_row.encode('utf-8'), CH_STATE_TABLE, 'JSONEachRow')
+    elif backend != 'none':
+        raise ValueError('Unknown checkpoint backend: ' + backend)
+
+class LoadCheckpoint:
+    """
+    Position of the issues load: queries of time slices of the load window, scroll position of every query,
+    number of committed batches and the latest update time of committed issues.
+    It is saved after every batch uploaded to database, so invocation interrupted or timed out
+    in the middle of the load is resumed by the next one from the last committed batch while
+    Tracker scroll is alive, or from the beginning of unfinished time slices after it has expired,
+    instead of loading the whole window again. Watermark of the next load window
+    is moved only when the load is finished
+    """
+    def __init__(self, query_texts, scrolls=None, batches=0, issues=0, latest_updated_at='', name=CHECKPOINT_NAME, backend=TRACKER_CHECKPOINT_BACKEND):
+        self.query_texts = query_texts
+        self.scrolls = scrolls if scrolls is not None else {}
+        self.batches = batches
+        self.issues = issues
+        self.latest_updated_at = latest_updated_at
+        self.name = name
+        self.backend = backend
+
+    @classmethod
+    def resume(cls, name=CHECKPOINT_NAME, backend=TRACKER_CHECKPOINT_BACKEND):
+        """
+        Load checkpoint of unfinished load, None if the previous load has finished.
+        Time slices finished by the previous invocation are not loaded again. Scrolls expired
+        on Tracker side are started from the beginning of their slice
+        """
+        value = read_checkpoint(name, backend)
+        if value is None or value['status'] != 'running':
+            return None
+        scrolls = value['scrolls']
+        for query_text, scroll in scrolls.items():
+            if not scroll.get('done') and time.time() - scroll.get('fetched_at', 0) > TRACKER_SCROLL_TTL_MILLIS / 1000:
+                print(datetime.now(), 'Scroll of query', query_text, 'has expired, restarting it')
+                scrolls[query_text] = {}
+        return cls(value['query_texts'], scrolls, value['batches'], value['issues'], value.get('latest_updated_at', ''), name, backend)
+
+    def pending_query_texts(self):
+        return [q for q in self.query_texts if not self.scrolls.get(q, {}).get('done')]
+
+    def save(self, status='running'):
+        write_checkpoint(self.name, {
+            'status': status,
+            'query_texts': self.query_texts,
+            'scrolls': self.scrolls,
+            'batches': self.batches,
+            'issues': self.issues,
+            'latest_updated_at': self.latest_updated_at,
+        }, self.backend)
+
+    def add_issues(self, issues_df):
+        self.batches += 1
+        self.issues += len(issues_df)
+        self.latest_updated_at = max(self.latest_updated_at, get_latest_updated_at(issues_df))
+
+    def commit(self, query_text, scroll, issues_df):
+        """
+        Save scroll position after batch of issues uploaded to database
+        """
+        self.scrolls[query_text] = scroll
+        self.add_issues(issues_df)
+        self.save()
+
+    def finish(self):
+        """
+        Mark load as finished and move watermark to the latest loaded issue
+        """
+        self.save('done')
+        watermark = max(read_checkpoint(WATERMARK_NAME, self.backend) or '', self.latest_updated_at)
+        if watermark != '':
+            write_checkpoint(WATERMARK_NAME, watermark, self.backend)
+
+def load_issues_batch(issues_json_data):
+    """
+    Load changelog for batch of issues, shape issues & changelog and upload them to database
+    
+    Arguments:
+        issues_json_data (json): batch of issues loaded from Tracker
+    Returns:
+        Dataframe with uploaded issues
+    """
+    changelog_marks = {}
+    changelog_json_data = get_tracker_issues_changelog(issues_json_data, marks=changelog_marks)
+    issues_df = shape_issues_data(issues_json_data)
+    changelog_df = shape_issue_changelog_data(changelog_json_data)
+    transitions_df = get_status_transitions(changelog_json_data, issues_df)
+    upload_data_to_db(issues_df, changelog_df, transitions_df)
+    upload_changelog_marks(changelog_marks)
+    return issues_df
+
+def load_issues_streaming(checkpoint):
+    """
+    Load issues in streaming mode: every scroll page of issues is loaded, shaped & uploaded
+    to database as one batch, so peak memory depends on page size, not on total number of issues
+    
+    Arguments:
+        checkpoint (LoadCheckpoint): load position, committed after every batch
+    Returns:
+        Nothing
+    """
+    for query_text, scroll, issues_page in iter_issue_pages(checkpoint.pending_query_texts(), checkpoint.scrolls):
+        issues_df = load_issues_batch(issues_page)
+        checkpoint.commit(query_text, scroll, issues_df)
+        print(datetime.now(), 'Batch', checkpoint.batches, 'uploaded, total issues: ', checkpoint.issues)
+
+class PipelineStopped(Exception):
+    """
+    Raised in pipeline stage when another stage has failed and the whole pipeline is stopping
+    """
+
+class PipelineStage:
+    """
+    Pipeline stage counters: processed batches & records, time spent on processing
+    and depth of the input queue, sampled every time a batch is taken from the queue
+    """
+    def __init__(self, name, input_queue=None):
+        self.name = name
+        self.input_queue = input_queue
+        self.batches = 0
+        self.records = 0
+        self.busy_seconds = 0.0
+        self.queue_depth_total = 0
+        self.queue_depth_max = 0
+
+    def sample_queue_depth(self):
+        depth = self.input_queue.qsize()
+        self.queue_depth_total += depth
+        self.queue_depth_max = max(self.queue_depth_max, depth)
+
+    def add_batch(self, records, busy_seconds):
+        self.batches += 1
+        self.records += records
+        self.busy_seconds += busy_seconds
+
+    def report(self):
+        throughput = self.records / self.busy_seconds if self.busy_seconds > 0 else 0.0
+        report = '{name}: batches {batches}, records {records}, busy {busy:.1f}s, {throughput:.0f} records/s'.format(
+            name=self.name, batches=self.batches, records=self.records,
+            busy=self.busy_seconds, throughput=throughput)
+        if self.input_queue is not None:
+            queue_depth_avg = self.queue_depth_total / self.batches if self.batches > 0 else 0.0
+            report += ', queue depth avg {avg:.1f} max {max}'.format(avg=queue_depth_avg, max=self.queue_depth_max)
+        return report
+
+def put_to_pipeline_queue(pipeline_queue, item, stop_event):
+    """
+    Put item to bounded queue, waiting for free space unless the pipeline is stopping
+    """
+    while True:
+        if stop_event.is_set():
+            raise PipelineStopped()
+        try:
+            pipeline_queue.put(item, timeout=1)
+            return
+        except Full:
+            pass
+
+def get_from_pipeline_queue(pipeline_queue, stop_event):
+    """
+    Get item from queue, waiting for it unless the pipeline is stopping
+    """
+    while True:
+        if stop_event.is_set():
+            raise PipelineStopped()
+        try:
+            return pipeline_queue.get(timeout=1)
+        except Empty:
+            pass
+
+def run_pipeline_stage(stage, process_batch, output_queue, stop_event, errors):
+    """
+    Pipeline stage worker: take batches from the stage input queue, process them and pass
+    results to the output queue. None in the input queue marks the end of data.
+    
+    Arguments:
+        stage (PipelineStage): stage with input queue & counters
+        process_batch (function): returns tuple (result, number of processed records)
+        output_queue (Queue): queue of the next stage, None for the last stage
+        stop_event (Event): set when any stage fails
+        errors (list): collected exceptions of failed stages
+    Returns:
+        Nothing
+    """
+    try:
+        while True:
+            batch = get_from_pipeline_queue(stage.input_queue, stop_event)
+            if batch is None:
+                break
+            stage.sample_queue_depth()
+            started = time.monotonic()
+            result, records = process_batch(batch)
+            stage.add_batch(records, time.monotonic() - started)
+            if output_queue is not None:
+                put_to_pipeline_queue(output_queue, result, stop_event)
+        if output_queue is not None:
+            put_to_pipeline_queue(output_queue, None, stop_event)
+    except PipelineStopped:
+        pass
+    except Exception as err:
+        errors.append(err)
+        stop_event.set()
+
+def load_issues_pipeline(checkpoint, queue_size=TRACKER_PIPELINE_QUEUE_SIZE):
+    """
+    Load issues with staged pipeline: fetch stage (issues scroll page & its changelog) runs
+    in the calling thread, shape & upload stages run in their own threads and are connected
+    by bounded queues, so uploading of batch N overlaps fetching of batch N+1.
+    Load position is committed by the upload stage, after the batch is uploaded
+    
+    Arguments:
+        checkpoint (LoadCheckpoint): load position, committed after every batch
+        queue_size (int): max number of batches waiting between two stages
+    Returns:
+        Nothing
+    """
+    shape_queue = Queue(maxsize=queue_size)
+    upload_queue = Queue(maxsize=queue_size)
+    stop_event = Event()
+    errors = []
+
+    fetch_stage = PipelineStage('fetch')
+    shape_stage = PipelineStage('shape', shape_queue)
+    upload_stage = PipelineStage('upload', upload_queue)
+
+    def shape_batch(batch):
+        issues_json_data, changelog_json_data, changelog_marks, position = batch
+        issues_df = shape_issues_data(issues_json_data)
+        changelog_df = shape_issue_changelog_data(changelog_json_data)
+        transitions_df = get_status_transitions(changelog_json_data, issues_df)
+        return (issues_df, changelog_df, transitions_df, changelog_marks, position), len(issues_df) + len(changelog_df)
+
+    def upload_batch(batch):
+        issues_df, changelog_df, transitions_df, changelog_marks, (query_text, scroll) = batch
+        upload_data_to_db(issues_df, changelog_df, transitions_df)
+        upload_changelog_marks(changelog_marks)
+        checkpoint.commit(query_text, scroll, issues_df)
+        return None, len(issues_df) + len(changelog_df)
+
+    workers = [
+        Thread(target=run_pipeline_stage, args=(shape_stage, shape_batch, upload_queue, stop_event, errors)),
+        Thread(target=run_pipeline_stage, args=(upload_stage, upload_batch, None, stop_event, errors)),
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        started = time.monotonic()
+        for query_text, scroll, issues_page in iter_issue_pages(checkpoint.pending_query_texts(), checkpoint.scrolls):
+            changelog_marks = {}
+            changelog_json_data = get_tracker_issues_changelog(issues_page, marks=changelog_marks)
+            fetch_stage.add_batch(len(issues_page) + len(changelog_json_data), time.monotonic() - started)
+            put_to_pipeline_queue(shape_queue, (issues_page, changelog_json_data, changelog_marks, (query_text, scroll)), stop_event)
+            started = time.monotonic()
+        put_to_pipeline_queue(shape_queue, None, stop_event)
+    except PipelineStopped:
+        pass
+    except Exception as err:
+        errors.append(err)
+        stop_event.set()
+    finally:
+        for worker in workers:
+            worker.join()
+        for stage in (fetch_stage, shape_stage, upload_stage):
+            print(datetime.now(), 'Pipeline stage', stage.report())
+
+    if errors:
+        raise errors[0]
+
+MODULE_LOAD_REPORTED = False
+
+def report_module_load():
+    """
+    Print time spent on module load by cold start, once per function instance
+    """
+    global MODULE_LOAD_REPORTED
+    if MODULE_LOAD_REPORTED:
+        return
+    MODULE_LOAD_REPORTED = True
+    print(datetime.now(), 'Module loaded in {total:.0f} ms: imports {imports:.0f} ms, config {config:.0f} ms'.format(
+        total=(MODULE_LOADED - MODULE_LOAD_STARTED) * 1000,
+        imports=(MODULE_IMPORTS_FINISHED - MODULE_LOAD_STARTED) * 1000,
+        config=(MODULE_LOADED - MODULE_IMPORTS_FINISHED) * 1000))
 
 def handler(event, context):
+    report_module_load()
+    #pandas is needed only to shape loaded data, it is imported in background while database & Tracker are queried
+    Thread(target=pd.load, daemon=True).start()
     init_database(drop_table=False)
-    tracker_query_text = get_issues_query_text()
+    checkpoint = LoadCheckpoint.resume()
+    if checkpoint is not None:
+        print(datetime.now(), 'Resuming interrupted load after', checkpoint.batches, 'batches,', checkpoint.issues, 'issues')
+    else:
+        checkpoint = LoadCheckpoint(get_issues_query_texts(slice_hours=TRACKER_LOAD_SLICE_HOURS if TRACKER_LOAD_MODE != 'full' else 0))
+        checkpoint.save()
+    if TRACKER_LOAD_MODE == 'streaming':
+        print(datetime.now(), "Starting streaming load of issues")
+        load_issues_streaming(checkpoint)
+        print(datetime.now(), "Finished streaming load of issues")
+        checkpoint.finish()
+        return
+    if TRACKER_LOAD_MODE == 'pipeline':
+        print(datetime.now(), "Starting pipeline load of issues")
+        load_issues_pipeline(checkpoint)
+        print(datetime.now(), "Finished pipeline load of issues")
+        checkpoint.finish()
+        return
+    #full load uploads all issues at once, so only the load window is resumed, not the scroll position
     print(datetime.now(), "Starting loading issues")
-    tracker_isses_json_data = get_tracker_issue_list(TRACKER_API_URL_BASE_FOR_ISSUE_LIST, query_text=tracker_query_text)
+    tracker_query_texts = checkpoint.query_texts
+    if len(tracker_query_texts) == 1:
+        tracker_isses_json_data = get_tracker_issue_list(TRACKER_API_URL_BASE_FOR_ISSUE_LIST, query_text=tracker_query_texts[0])
+    else:
+        tracker_isses_json_data = list(chain.from_iterable(page for _, _, page in iter_issue_pages(tracker_query_texts)))
+        print('Tracker data loaded, total records: ', len(tracker_isses_json_data))
     print(datetime.now(), "Finished loading issues")
-    tracker_isses_changelog_json_data = get_tracker_issues_changelog(tracker_isses_json_data)
+    tracker_changelog_marks = {}
+    tracker_isses_changelog_json_data = get_tracker_issues_changelog(tracker_isses_json_data, marks=tracker_changelog_marks)
     tracker_issues_df_data = shape_issues_data(tracker_isses_json_data)
     tracker_issues_changelog_df_data = shape_issue_changelog_data(tracker_isses_changelog_json_data)
-    upload_data_to_db(tracker_issues_df_data, tracker_issues_changelog_df_data)
+    tracker_status_transitions_df_data = get_status_transitions(tracker_isses_changelog_json_data, tracker_issues_df_data)
+    upload_data_to_db(tracker_issues_df_data, tracker_issues_changelog_df_data, tracker_status_transitions_df_data)
+    upload_changelog_marks(tracker_changelog_marks)
+    checkpoint.add_issues(tracker_issues_df_data)
+    checkpoint.finish()
+
+MODULE_LOADED = time.perf_counter()
 
 if __name__ == "__main__":
     handler(None, None)
\ No newline at end of file